@@ -0,0 +1,115 @@
+import threading
+import numpy as np
+from networking import STOCK_TICKERS, ETF_TICKERS
+
+BUY = "BUY"
+MAX_TICKS = 10_000  # length of the per-tick P&L curve
+
+
+class Ledger:
+    """
+    Incremental P&L and exposure per instrument, kept in NumPy arrays.
+
+    Each fill is an O(1) update of one slot (position, average cost, realized
+    P&L). Unrealized P&L, exposure and totals are vectorized over all
+    instruments. Prices of USD instruments are converted with `fx` (CAD per USD).
+    """
+
+    def __init__(self, tickers=None, usd_tickers=("JOY_U",), max_ticks=MAX_TICKS):
+        self.tickers = list(tickers or STOCK_TICKERS + ETF_TICKERS)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.position = np.zeros(n, dtype=np.int64)
+        self.avg_cost = np.zeros(n)
+        self.realized = np.zeros(n)
+        self.marks = np.full(n, np.nan)
+        self.is_usd = np.array([t in usd_tickers for t in self.tickers])
+        self.fx = 1.0
+
+        # order_id -> (quantity_filled, notional) already booked, so repeated payloads are idempotent
+        self.booked = {}
+        self.pnl_curve = np.full(max_ticks, np.nan)
+        self.lock = threading.RLock()
+
+    def on_fill(self, ticker, action, quantity, price):
+        """Book `quantity` shares traded at `price`."""
+        i = self.index.get(ticker)
+        if i is None or quantity <= 0:
+            return
+        signed = quantity if action == BUY else -quantity
+
+        with self.lock:
+            pos = int(self.position[i])
+            if pos == 0 or (pos > 0) == (signed > 0):
+                # opening or adding: average the cost in
+                self.avg_cost[i] = (self.avg_cost[i] * abs(pos) + price * quantity) / (abs(pos) + quantity)
+            else:
+                closing = min(quantity, abs(pos))
+                self.realized[i] += closing * (price - self.avg_cost[i]) * (1 if pos > 0 else -1)
+                if quantity > abs(pos):
+                    self.avg_cost[i] = price  # flipped through zero, the rest opens at this price
+            self.position[i] = pos + signed
+            if self.position[i] == 0:
+                self.avg_cost[i] = 0.0
+
+    def on_order(self, order):
+        """
+        Order listener (see networking.order_listeners): books whatever part of
+        the order has filled since we last saw it, at the incremental VWAP.
+        """
+        filled = order.get("quantity_filled") or 0
+        vwap = order.get("vwap")
+        if not filled or vwap is None:
+            return
+        order_id = order.get("order_id")
+        with self.lock:
+            prev_filled, prev_notional = self.booked.get(order_id, (0, 0.0))
+            new = filled - prev_filled
+            if new <= 0:
+                return
+            notional = vwap * filled
+            self.booked[order_id] = (filled, notional)
+            self.on_fill(order["ticker"], order["action"], new, (notional - prev_notional) / new)
+
+    def mark(self, prices, fx=None):
+        """Update mark prices from a ticker -> price dict."""
+        for ticker, price in prices.items():
+            i = self.index.get(ticker)
+            if i is not None and price is not None:
+                self.marks[i] = price
+        if fx is not None:
+            self.fx = fx
+
+    def _to_cad(self, values):
+        return np.where(self.is_usd, values * self.fx, values)
+
+    def unrealized(self):
+        # instruments without a mark yet contribute nothing rather than a mark of 0
+        marked = (self.position != 0) & ~np.isnan(self.marks)
+        marks = np.where(marked, self.marks, self.avg_cost)
+        open_pnl = np.where(marked, self.position * (marks - self.avg_cost), 0.0)
+        return self._to_cad(open_pnl)
+
+    def total_pnl(self):
+        return float(self._to_cad(self.realized).sum() + self.unrealized().sum())
+
+    def exposure(self):
+        """(gross, net) in shares, as the exchange's limits count them."""
+        return int(np.abs(self.position).sum()), int(self.position.sum())
+
+    def record_tick(self, tick):
+        """Store the current total P&L for `tick`; the curve is then a plain array slice."""
+        if tick is not None and 0 <= tick < len(self.pnl_curve):
+            self.pnl_curve[tick] = self.total_pnl()
+
+    def summary(self):
+        unrealized = self.unrealized()
+        return {
+            ticker: {
+                "position": int(self.position[i]),
+                "avg_cost": float(self.avg_cost[i]),
+                "realized": float(self.realized[i]),
+                "unrealized": float(unrealized[i]),
+            }
+            for ticker, i in self.index.items()
+        }
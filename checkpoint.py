@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import numpy as np
+
+CHECKPOINT_DIR = "checkpoint"
+MAX_AGE = 300  # seconds; an older checkpoint is from an earlier run of the case
+
+# file layout (float64): header, then the length of every window, then one row per window
+SEQ, TICK, STARTED, SAVED_AT = range(4)
+HEADER_SIZE = 4
+
+
+class Checkpoint:
+    """
+    Periodic snapshot of the price windows and strategy state, for a warm restart.
+
+    The windows live in a memory-mapped .npy that is rewritten in place, so a
+    checkpoint is a few array copies and no allocation. Like the quote bus the
+    sequence number is odd while a write is in progress; a file left odd by a
+    crash is ignored. The small order-queue state goes to a JSON file next to
+    it, swapped in atomically.
+    """
+
+    def __init__(self, series, window, directory=CHECKPOINT_DIR):
+        self.series = list(series)
+        self.window = window
+        self.directory = directory
+        self.path = os.path.join(directory, "windows.npy")
+        self.state_path = os.path.join(directory, "state.json")
+        self.size = HEADER_SIZE + len(self.series) * (1 + window)
+        self.map = None
+
+    def _split(self, data):
+        n = len(self.series)
+        lengths = data[HEADER_SIZE:HEADER_SIZE + n]
+        rows = data[HEADER_SIZE + n:].reshape(n, self.window)
+        return lengths, rows
+
+    def save(self, windows, tick, started, state=None):
+        """windows: name -> sequence of at most `window` values (e.g. the rolling deques)."""
+        if self.map is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.map = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.float64, shape=(self.size,))
+
+        data = self.map
+        lengths, rows = self._split(data)
+        data[SEQ] += 1  # odd -> being written
+        data[TICK] = np.nan if tick is None else tick
+        data[STARTED] = started
+        data[SAVED_AT] = time.time()
+        for i, name in enumerate(self.series):
+            values = np.asarray(list(windows[name]), dtype=np.float64)[-self.window:]
+            lengths[i] = len(values)
+            rows[i, :len(values)] = values
+        data[SEQ] += 1  # even -> consistent
+        data.flush()
+
+        if state is not None:
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+
+    def load(self, max_age=MAX_AGE):
+        """Returns {"tick", "started", "windows", "state"}, or None if there is no usable checkpoint."""
+        try:
+            data = np.load(self.path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if data.shape != (self.size,) or data[SEQ] % 2 or time.time() - data[SAVED_AT] > max_age:
+            return None
+
+        lengths, rows = self._split(data)
+        windows = {name: np.array(rows[i, :int(lengths[i])]) for i, name in enumerate(self.series)}
+
+        state = {}
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        return {
+            "tick": None if np.isnan(data[TICK]) else int(data[TICK]),
+            "started": bool(data[STARTED]),
+            "windows": windows,
+            "state": state,
+        }
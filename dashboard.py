@@ -0,0 +1,135 @@
+import os
+import time
+import multiprocessing as mp
+import numpy as np
+from market_data import QuoteBus, BUS_NAME
+from networking import STOCK_TICKERS
+
+HISTORY_SIZE = 20_000    # samples kept by the dashboard process
+MAX_POINTS = 1_000       # points actually drawn per line
+SAMPLE_INTERVAL = 0.25   # seconds between reads of the quote bus
+REFRESH_INTERVAL = 1.0   # seconds between redraws
+SNAPSHOT_FILE = "dashboard.png"
+SERIES = ["JOY_C", "eq_joy_c", "JOY_U", "eq_joy_u"]
+
+
+class PriceHistory:
+    """Fixed-size ring buffer of the plotted series, filled from the quote bus."""
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self.data = np.full((len(SERIES), size), np.nan)
+        self.count = 0
+        self.last_seq = None
+
+    def sample(self, bus):
+        """Append one row if the bus has moved since the last sample."""
+        snapshot = bus.read()
+        if snapshot["seq"] == self.last_seq:
+            return False
+        self.last_seq = snapshot["seq"]
+
+        quotes = snapshot["quotes"]
+        mids = {}
+        for ticker, (bid, ask) in quotes.items():
+            if bid is None or ask is None:
+                return False
+            mids[ticker] = (bid + ask) / 2
+
+        eq_joy_c = sum(mids[t] for t in STOCK_TICKERS)
+        row = (mids["JOY_C"], eq_joy_c, mids["JOY_U"], eq_joy_c / snapshot["fx"])
+        self.data[:, self.count % self.size] = row
+        self.count += 1
+        return True
+
+    def decimated(self, max_points=MAX_POINTS):
+        """Return (x, series) in time order, striding so at most max_points are drawn."""
+        n = min(self.count, self.size)
+        start = self.count - n
+        stride = max(1, -(-n // max_points))
+        x = np.arange(start, self.count, stride)
+        return x, self.data[:, x % self.size]
+
+
+def run_dashboard(name=BUS_NAME, headless=False):
+    """Entry point of the dashboard process."""
+    # plotting is only ever imported here, never in the trading process
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    try:
+        os.nice(10)  # yield the CPU to the trading processes
+    except (AttributeError, OSError):
+        pass
+
+    bus = QuoteBus(name)
+    history = PriceHistory()
+
+    fig, ax = plt.subplots(1, 2, figsize=(12, 6))
+    lines = [
+        ax[0].plot([], [], label="actual", color="blue")[0],
+        ax[0].plot([], [], label="eq", color="red")[0],
+        ax[1].plot([], [], label="actual", color="blue")[0],
+        ax[1].plot([], [], label="eq", color="red")[0],
+    ]
+    ax[0].set_title("C")
+    ax[1].set_title("U")
+    for a in ax:
+        a.set_xlabel("Time")
+        a.set_ylabel("Price")
+        a.legend()
+    if not headless:
+        plt.ion()
+        plt.show()
+
+    last_draw = 0.0
+    drawn_count = 0
+    try:
+        while True:
+            history.sample(bus)
+            now = time.monotonic()
+
+            if now - last_draw >= REFRESH_INTERVAL and history.count > drawn_count:
+                x, series = history.decimated()
+                for line, y in zip(lines, series):
+                    line.set_data(x, y)
+
+                # only touch the limits when the data leaves them, instead of relim() each frame
+                for i, a in enumerate(ax):
+                    pair = series[2 * i: 2 * i + 2]
+                    if not np.isfinite(pair).any():
+                        continue
+                    lo, hi = np.nanmin(pair), np.nanmax(pair)
+                    y_lo, y_hi = a.get_ylim()
+                    if lo < y_lo or hi > y_hi or drawn_count == 0:
+                        pad = max((hi - lo) * 0.1, 0.01)
+                        a.set_ylim(lo - pad, hi + pad)
+                    a.set_xlim(x[0], max(x[-1], x[0] + 1))
+
+                if headless:
+                    fig.savefig(SNAPSHOT_FILE)
+                else:
+                    fig.canvas.draw_idle()
+                    fig.canvas.flush_events()
+                drawn_count = history.count
+                last_draw = now
+
+            time.sleep(SAMPLE_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.close()
+
+
+def start_dashboard_process(name=BUS_NAME, headless=False):
+    """Start the dashboard next to a running market-data process."""
+    process = mp.Process(target=run_dashboard, args=(name, headless), daemon=True, name="dashboard")
+    process.start()
+    return process
+
+
+if __name__ == "__main__":
+    import sys
+    run_dashboard(headless="--headless" in sys.argv)
@@ -0,0 +1,67 @@
+import json
+import numpy as np
+
+# orjson parses straight from bytes several times faster than json; optional
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+class Securities:
+    """
+    Compact view of a /securities response: one NumPy array per field we use,
+    aligned with `tickers`. Nothing else from the payload is kept.
+    """
+    __slots__ = ("tickers", "index", "position", "last", "bid", "ask", "vwap")
+
+    def __init__(self, tickers, position, last, bid, ask, vwap):
+        self.tickers = tickers
+        self.index = {ticker: i for i, ticker in enumerate(tickers)}
+        self.position = position
+        self.last = last
+        self.bid = bid
+        self.ask = ask
+        self.vwap = vwap
+
+    def positions(self, exclude=()):
+        return {t: int(p) for t, p in zip(self.tickers, self.position) if t not in exclude}
+
+    def get(self, field, ticker, default=None):
+        i = self.index.get(ticker)
+        return default if i is None else float(getattr(self, field)[i])
+
+
+def decode_securities(content):
+    rows = loads(content)
+    n = len(rows)
+    tickers = [None] * n
+    fields = np.empty((5, n))
+    for i, sec in enumerate(rows):
+        tickers[i] = sec["ticker"]
+        fields[0, i] = sec["position"]
+        fields[1, i] = sec["last"]
+        fields[2, i] = sec["bid"]
+        fields[3, i] = sec["ask"]
+        fields[4, i] = sec.get("vwap") or np.nan
+    return Securities(tickers, *fields)
+
+
+def decode_book(content):
+    """Returns (best_bid, best_ask, bid_depth, ask_depth); prices are None for an empty side."""
+    book = loads(content)
+    bids, asks = book["bids"], book["asks"]
+    best_bid = max(level["price"] for level in bids) if bids else None
+    best_ask = min(level["price"] for level in asks) if asks else None
+    return best_bid, best_ask, len(bids), len(asks)
+
+
+def decode_tenders(content):
+    """The parsed rows are already one dict per tender; copying out a subset of fields cost more than it saved."""
+    return loads(content)
+
+
+def decode_orders(content):
+    """One dict per order, as parsed."""
+    return loads(content)
@@ -0,0 +1,175 @@
+import csv
+import time
+import threading
+from collections import OrderedDict
+
+BUY = "BUY"
+QUANTILES = (0.5, 0.9, 0.99)
+MAX_UNMATCHED = 1_000  # fills seen before their order was stamped, kept briefly
+UNMATCHED_TTL = 5.0    # seconds; a stamp comes right after the POST, older early fills never get one
+REPORT_FILE = "execution_report.csv"
+
+
+class P2Quantile:
+    """Streaming quantile estimate (the P-square algorithm): five markers, O(1) per sample."""
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self.q = []
+        self.pos = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        if self.n < 5:
+            self.q.append(x)
+            self.n += 1
+            if self.n == 5:
+                self.q.sort()
+            return
+        self.n += 1
+        q, pos = self.q, self.pos
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                pos[i] += d
+
+    def value(self):
+        if self.n == 0:
+            return None
+        if self.n < 5:
+            ordered = sorted(self.q)
+            return ordered[round(self.p * (self.n - 1))]
+        return self.q[2]
+
+
+class StreamingStats:
+    """Count, mean and a few streaming quantiles of one metric."""
+
+    def __init__(self, quantiles=QUANTILES):
+        self.count = 0
+        self.mean = 0.0
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x):
+        self.count += 1
+        self.mean += (x - self.mean) / self.count
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    def snapshot(self):
+        out = {"count": self.count, "mean": self.mean}
+        for p, estimator in self.quantiles.items():
+            out[f"p{round(p * 100)}"] = estimator.value()
+        return out
+
+
+class ExecutionTracker:
+    """
+    Joins every order to the quote and time at which we decided to send it.
+
+    stamp() is called right after placing an order; fills arrive through
+    on_order (an order listener). For each filled order we keep slippage
+    against the decision-time mid (positive = it cost us, in dollars per share
+    and bps) and decision-to-fill latency, as streaming percentiles per
+    (ticker, strategy).
+    """
+
+    def __init__(self):
+        self.stamps = {}        # order_id -> (ticker, action, strategy, mid, decided_at)
+        self.unmatched = OrderedDict()
+        self.scored = set()     # order ids already measured; the TRANSACTED list replays them
+        self.stats = {}         # (ticker, strategy) -> {"slippage": ..., "slippage_bps": ..., "latency": ...}
+        self.records = []       # one row per filled order, for the case-end export
+        self.lock = threading.Lock()
+
+    def stamp(self, order_id, ticker, action, strategy, decision_mid, decided_at):
+        if order_id is None or decision_mid is None:
+            return
+        with self.lock:
+            self.stamps[order_id] = (ticker, action, strategy, decision_mid, decided_at)
+            early = self.unmatched.pop(order_id, None)
+        if early is not None:
+            self.on_order(*early)
+
+    def on_order(self, order, seen_at=None):
+        filled = order.get("quantity_filled") or 0
+        vwap = order.get("vwap")
+        if not filled or vwap is None:
+            return
+        # only score orders once they are done filling
+        if order.get("status", "TRANSACTED") == "OPEN" and filled < (order.get("quantity") or filled):
+            return
+        seen_at = seen_at or time.monotonic()
+        order_id = order.get("order_id")
+
+        with self.lock:
+            if order_id in self.scored:
+                return
+            stamp = self.stamps.pop(order_id, None)
+            if stamp is None:
+                # unstamped orders (quotes, tenders we did not stamp) show up again in every
+                # TRANSACTED replay; keep the first sighting and age them out
+                self.unmatched.setdefault(order_id, (order, seen_at))
+                while self.unmatched and (len(self.unmatched) > MAX_UNMATCHED
+                                          or seen_at - next(iter(self.unmatched.values()))[1] > UNMATCHED_TTL):
+                    self.unmatched.popitem(last=False)
+                return
+
+            ticker, action, strategy, mid, decided_at = stamp
+            self.scored.add(order_id)
+            sign = 1 if action == BUY else -1
+            slippage = (vwap - mid) * sign
+            latency = seen_at - decided_at
+
+            stats = self.stats.setdefault((ticker, strategy), {
+                "slippage": StreamingStats(),
+                "slippage_bps": StreamingStats(),
+                "latency": StreamingStats(),
+            })
+            stats["slippage"].add(slippage)
+            stats["slippage_bps"].add(slippage / mid * 10_000)
+            stats["latency"].add(latency)
+            self.records.append((order_id, ticker, strategy, action, filled, mid, vwap, slippage, latency))
+
+    def summary(self):
+        """(ticker, strategy) -> metric -> count/mean/percentiles, safe to call live."""
+        with self.lock:
+            return {key: {name: s.snapshot() for name, s in metrics.items()}
+                    for key, metrics in self.stats.items()}
+
+    def export(self, path=REPORT_FILE):
+        with self.lock:
+            records = list(self.records)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["order_id", "ticker", "strategy", "action", "quantity",
+                             "decision_mid", "fill_vwap", "slippage", "latency_s"])
+            writer.writerows(records)
+        return path
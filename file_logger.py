@@ -3,26 +3,35 @@ import signal
 
 class FileLogger:
     def __init__(self, filename="log.txt"):
+        # nothing is opened or installed here, so creating a logger at import time is free
         self.filename = filename
-        self.file = open(self.filename, "a", encoding="utf-8", buffering=1)  # Line-buffered writing
-        self.log("\nStarting logging")
+        self.file = None
 
-        # Handle cleanup on Ctrl+C
+    def open(self):
+        if self.file is None:
+            self.file = open(self.filename, "a", encoding="utf-8", buffering=1)  # Line-buffered writing
+            self.file.write("\nStarting logging\n")
+
+    def install_signal_handlers(self):
+        """Handle cleanup on Ctrl+C. Call from the program's entry point, not at import."""
         signal.signal(signal.SIGINT, self.cleanup)
         signal.signal(signal.SIGTERM, self.cleanup)
 
     def log(self, message):
         """Write a message to the log file."""
+        self.open()
         self.file.write(str(message) + "\n")
         self.file.flush()  # Ensure immediate writing
 
     def cleanup(self, signum=None, frame=None):
         """Ensure the file is closed properly on exit."""
         print("\nClosing log file...")
-        self.file.close()
+        if self.file is not None:
+            self.file.close()
         sys.exit(0)
 
 # Example usage:
 if __name__ == "__main__":
     logger = FileLogger()
+    logger.install_signal_handlers()
     logger.log("Logging system initialized.")
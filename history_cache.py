@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from networking import get_json, get_current_tick, STOCK_TICKERS, ETF_TICKERS
+from tick_clock import tick_clock
+
+OHLC_DTYPE = np.dtype([
+    ("tick", np.int32),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+])
+INITIAL_CAPACITY = 600  # a RIT period is 300 ticks, so this usually never grows
+DEFAULT_LIMIT = 50
+
+
+def parse_ohlc(rows):
+    """Turn a securities/history response (newest first) into an oldest-first OHLC array."""
+    out = np.empty(len(rows), dtype=OHLC_DTYPE)
+    for i, row in enumerate(reversed(rows)):
+        out[i] = (row["tick"], row["open"], row["high"], row["low"], row["close"])
+    return out
+
+
+class OHLCHistory:
+    """Growable OHLC array for one ticker."""
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.data = np.empty(capacity, dtype=OHLC_DTYPE)
+        self.count = 0
+
+    @property
+    def last_tick(self):
+        return int(self.data["tick"][self.count - 1]) if self.count else None
+
+    def merge(self, candles):
+        """Append new candles, replacing any we already hold from the first new tick on."""
+        if not len(candles):
+            return
+        # the newest candle we hold may still have been forming when we fetched it
+        keep = int(np.searchsorted(self.data["tick"][:self.count], candles["tick"][0]))
+        needed = keep + len(candles)
+        if needed > len(self.data):
+            grown = np.empty(max(needed, 2 * len(self.data)), dtype=OHLC_DTYPE)
+            grown[:keep] = self.data[:keep]
+            self.data = grown
+        self.data[keep:needed] = candles
+        self.count = needed
+
+    def recent(self, limit):
+        return self.data[max(0, self.count - limit):self.count]
+
+
+class OHLCCache:
+    """Per-ticker local OHLC history that only ever asks the API for candles it does not have."""
+
+    def __init__(self):
+        self.histories = {}
+        self.lock = threading.Lock()
+
+    def history(self, ticker):
+        with self.lock:
+            if ticker not in self.histories:
+                self.histories[ticker] = OHLCHistory()
+            return self.histories[ticker]
+
+    def refresh(self, ticker, current_tick=None, limit=None):
+        """
+        Fetch the candles newer than the last one cached (including it, as it may
+        have changed). An explicit limit forces a fetch of that many candles.
+        """
+        history = self.history(ticker)
+        last_tick = history.last_tick
+        if limit is None:
+            limit = DEFAULT_LIMIT
+            if last_tick is not None:
+                if current_tick is None:
+                    current_tick = tick_clock.tick() if tick_clock.calibrated else get_current_tick()
+                if current_tick is not None:
+                    limit = max(1, current_tick - last_tick + 1)
+
+        rows = get_json("securities/history", {"ticker": ticker, "limit": limit})
+        if rows:
+            history.merge(parse_ohlc(rows))
+        return history
+
+    def recent(self, ticker, limit=DEFAULT_LIMIT):
+        """Last `limit` candles, oldest first, fetching only what is missing."""
+        history = self.history(ticker)
+        if history.count < limit:
+            self.refresh(ticker, limit=limit)
+        else:
+            self.refresh(ticker)
+        return history.recent(limit)
+
+    def prefill(self, tickers=None, current_tick=None):
+        """Load the whole case so far for every ticker concurrently."""
+        tickers = tickers or STOCK_TICKERS + ETF_TICKERS
+        if current_tick is None:
+            current_tick = tick_clock.tick() if tick_clock.calibrated else get_current_tick()
+        limit = max(DEFAULT_LIMIT, current_tick or 0)
+
+        with ThreadPoolExecutor(max_workers=len(tickers)) as pool:
+            list(pool.map(lambda t: self.refresh(t, current_tick, limit), tickers))
+
+
+ohlc_cache = OHLCCache()
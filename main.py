@@ -1,26 +1,54 @@
 import time
+import atexit
 from order_queue import OrderQueue  # Import the OrderQueue class
 from networking import *
 from collections import deque
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import threading
+from market_data import start_market_data_process, QuoteChanges
+from dashboard import start_dashboard_process
+from history_cache import ohlc_cache
+from spread_stats import SpreadStats
+from tick_clock import tick_clock
+from security_registry import registry, place_order
+from profiler import profiler
+from task_runtime import TaskRuntime
+from recorder import SessionRecorder
+from execution import ExecutionTracker
+from checkpoint import Checkpoint
+from tender_watcher import TenderWatcher, TENDER_POLL_INTERVAL
  
 # Trading Settings
 MAX_LONG_EXPOSURE = 300_000
 MAX_SHORT_EXPOSURE = 200_000
-ORDER_LIMIT_STOCK = 50_000
-ORDER_LIMIT_ETF = 100_000
 ROLLING_WINDOW_SIZE = 500
  
 BUY = "BUY"
 SELL = "SELL"
 ORDER_SIZE = 1_000
+SPREAD_THRESHOLD = 0.5 # minimum edge in dollars before we trade the spread
+SIGNAL_WINDOW = 200 # ticks of spread history behind the z-score
+Z_ENTRY = 2.0 # only trade when the spread is this many sigmas from its mean
+PASSIVE_ARB = False # rest limit orders on JOY_C and its stocks instead of crossing the spread
  
 started = False
  
  
 CHECK_INTERVAL = 1 # Market-making update interval
+# each strategy component runs as its own task: (seconds between runs, priority, 0 = most urgent)
+# the price windows keep one sample per CHECK_INTERVAL so ROLLING_WINDOW_SIZE still means seconds
+MARKET_INTERVAL, MARKET_PRIORITY = CHECK_INTERVAL, 0
+STOPS_INTERVAL, STOPS_PRIORITY = 0.5, 0
+TENDERS_INTERVAL, TENDERS_PRIORITY = TENDER_POLL_INTERVAL, 1
+ARBITRAGE_INTERVAL, ARBITRAGE_PRIORITY = CHECK_INTERVAL, 2
+ACCOUNTING_INTERVAL, ACCOUNTING_PRIORITY = CHECK_INTERVAL, 3
+CHECKPOINT_INTERVAL, CHECKPOINT_PRIORITY = CHECK_INTERVAL, 3
+USE_QUOTE_BUS = True # poll the exchange from a separate market-data process
+SHOW_DASHBOARD = False # live chart in its own process, needs USE_QUOTE_BUS
+HEADLESS_DASHBOARD = False # write dashboard.png instead of opening a window
+RECORD_SESSION = True # save the quotes we trade on to sessions/ for sweep.py
+RECORD_SAVE_EVERY = 60 # samples between saves of the recording
+PROFILE_STACKS = True # when profiling is toggled on (SIGUSR1 / Ctrl+Break), also sample stacks
+GATE_ON_CHANGES = True # skip arbitrage / stop checks while none of their quotes moved
+WARM_RESTART = True # reload price windows and order state from checkpoint/ after a restart
  
  
 # dict where rolling_prices[ticker] is a deque of the 20 last mid prices
@@ -29,18 +57,62 @@ rolling_prices = {
     for ticker in STOCK_TICKERS + ETF_TICKERS + ["eq_joy_c", "eq_joy_u"]
 }
  
+# streaming statistics of eq_joy_c - JOY_C and eq_joy_u - JOY_U
+spread_stats = {
+    "JOY_C": SpreadStats(),
+    "JOY_U": SpreadStats(),
+}
+ 
+# diffs of consecutive quote snapshots; each gated task subscribes to the tickers it reads
+quote_changes = QuoteChanges()
+arbitrage_inputs = quote_changes.subscribe(STOCK_TICKERS + ["JOY_C"])
+stops_inputs = quote_changes.subscribe(STOCK_TICKERS + ETF_TICKERS)
+stops_snapshot = None
+ 
+# set in main() when the market-data process is running
+quote_bus = None
+recorder = None
+exchange_rate = 1.0
+executions_exported = False
+ 
+# price windows and order state, saved every CHECKPOINT_INTERVAL for a warm restart
+checkpoint = Checkpoint(rolling_prices, ROLLING_WINDOW_SIZE)
+ 
 # Initialize Order Queue
-order_queue = OrderQueue()
+order_queue = OrderQueue(rolling_prices)
+ 
+# P&L and exposure, fed by every order payload the networking layer sees for this account
+ledger = default_account.ledger
+ 
+# slippage and latency of every order against the quote we decided on
+executions = ExecutionTracker()
+order_listeners.append(executions.on_order)
+order_queue.executions = executions
  
 def update_rolling_prices():
     """
     Fetch the latest bid/ask for each security, compute the mid-price,
     and append to the rolling deque.
     """
-    global started 
+    global started, exchange_rate
+ 
+    if quote_bus is not None:
+        snapshot = quote_bus.read()
+        quotes = snapshot["quotes"]
+        exchange_rate = snapshot["fx"]
+        quote_changes.update(quotes, snapshot["positions"])
+    else:
+        quotes = {ticker: get_bid_ask(ticker) for ticker in STOCK_TICKERS + ETF_TICKERS}
+        exchange_rate = get_exchange_rate()
+        quote_changes.update(quotes)
+ 
+    if recorder is not None:
+        recorder.record(tick_clock.tick(), exchange_rate, quotes)
+        if recorder.count % RECORD_SAVE_EVERY == 0:
+            recorder.save()
  
     for ticker in STOCK_TICKERS + ETF_TICKERS:
-        bid, ask = get_bid_ask(ticker)  
+        bid, ask = quotes[ticker]
         if bid is not None and ask is not None:
             mid_price = (bid + ask) / 2
             rolling_prices[ticker].append(mid_price)
@@ -51,10 +123,29 @@ def update_rolling_prices():
     stock_mid_price = sum(rolling_prices[p][-1] for p in STOCK_TICKERS)
     rolling_prices["eq_joy_c"].append(stock_mid_price)
  
-    exchange_rate = get_exchange_rate()
     eq_joy_u_value = stock_mid_price / exchange_rate
     rolling_prices["eq_joy_u"].append(eq_joy_u_value)
  
+    spread_stats["JOY_C"].update(stock_mid_price - rolling_prices["JOY_C"][-1])
+    spread_stats["JOY_U"].update(eq_joy_u_value - rolling_prices["JOY_U"][-1])
+ 
+def spread_signal(etf):
+    """
+    +1 to buy the ETF, -1 to sell it, 0 to do nothing.
+    The spread must clear SPREAD_THRESHOLD and, once the window is warm,
+    also sit Z_ENTRY sigmas away from its recent mean.
+    """
+    stats = spread_stats[etf].snapshot(SIGNAL_WINDOW)
+    if stats is None:
+        return 0
+ 
+    spread = stats["z"]
+    if abs(spread) <= SPREAD_THRESHOLD:
+        return 0
+    if spread_stats[etf].ready(SIGNAL_WINDOW) and abs(stats["z_sd"]) < Z_ENTRY:
+        return 0
+    return 1 if spread > 0 else -1
+ 
 def calculate_etf_values():
     """Calculate theoretical values for JOY_C and JOY_U based on stock prices."""
     stock_prices = {}
@@ -71,8 +162,7 @@ def calculate_etf_values():
     # JOY_C is simply the sum of these four stock mid-prices
     joy_c_value = sum(stock_prices.values())
  
-    # Convert JOY_C to USD for JOY_U
-    exchange_rate = get_exchange_rate()
+    # Convert JOY_C to USD for JOY_U, using the rate fetched with the prices
     joy_u_value = joy_c_value / exchange_rate
  
     return joy_c_value, joy_u_value
@@ -80,20 +170,26 @@ def calculate_etf_values():
 def sell_all(positions):
     for ticker, quantity in positions.items():
         if quantity > 0:
-            while quantity != 0:
-                trade_size = min(5_000, quantity)
-                print(f"📉 Selling {quantity} of {ticker}")
-                place_market_order("SELL", ticker, trade_size)
-                quantity -= trade_size
+            print(f"📉 Selling {quantity} of {ticker}")
+            place_order("SELL", ticker, quantity)
         elif quantity < 0:
-            while quantity != 0:
-                trade_size = min(5_000, -quantity)
-                print(f"📈 Buying {-quantity} of {ticker}")
-                place_market_order("BUY", ticker, trade_size)
-                quantity += trade_size
+            print(f"📈 Buying {-quantity} of {ticker}")
+            place_order("BUY", ticker, -quantity)
+ 
  
  
  
+def execute(action, ticker, quantity, strategy, decided_at):
+    """
+    Market order in registry-sized children, every child stamped with the mid and
+    time we decided on, for execution stats. No price on purpose: the legs of a
+    hedge must cross together; resting quotes are PASSIVE_ARB's job (joy_c_arb).
+    """
+    mid = rolling_prices[ticker][-1]
+    result = place_order(action, ticker, quantity)
+    for order_id in result["order_ids"]:
+        executions.stamp(order_id, ticker, action, strategy, mid, decided_at)
+    return result
  
 # returns True if hit limits after trade
 def check_limits(trade_size, gross, net):
@@ -108,6 +204,7 @@ def check_limits(trade_size, gross, net):
     return False
  
 def arbitrage():
+    decided_at = time.monotonic()
     joy_c_mid, joy_u_mid  = rolling_prices["JOY_C"][-1], rolling_prices["JOY_U"][-1]
     eq_joy_c, eq_joy_u = calculate_etf_values()
  
@@ -117,7 +214,13 @@ def arbitrage():
     # gross_exposure = sum(abs(v) for v in positions.values())
     # net_exposure = sum(positions.values())
  
-    if eq_joy_c - joy_c_mid > 0.5:
+    signal = spread_signal("JOY_C")
+ 
+    if PASSIVE_ARB:
+        passive_arbitrage(signal, eq_joy_c, trade_size)
+        return
+ 
+    if signal > 0:
         if order_queue.check_limits(trade_size * 4, SELL):
             order_queue.offload_for_tender(SELL, trade_size * 4)
             return
@@ -128,10 +231,10 @@ def arbitrage():
             return
  
  
-        place_market_order(BUY, "JOY_C", trade_size)
+        execute(BUY, "JOY_C", trade_size, "arbitrage", decided_at)
         for ticker in STOCK_TICKERS:
-            place_market_order(SELL, ticker, trade_size)
-    elif eq_joy_c - joy_c_mid < -0.5:
+            execute(SELL, ticker, trade_size, "arbitrage", decided_at)
+    elif signal < 0:
         if order_queue.check_limits(trade_size * 4, BUY):
             order_queue.offload_for_tender(BUY, trade_size * 4)
  
@@ -140,9 +243,9 @@ def arbitrage():
             order_queue.offload_for_tender(SELL, trade_size)
  
  
-        place_market_order(SELL, "JOY_C", trade_size)
+        execute(SELL, "JOY_C", trade_size, "arbitrage", decided_at)
         for ticker in STOCK_TICKERS:
-            place_market_order(BUY, ticker, trade_size)
+            execute(BUY, ticker, trade_size, "arbitrage", decided_at)
  
  
     # if eq_joy_u - joy_u_mid > 0.2:
@@ -161,111 +264,234 @@ def arbitrage():
     #     for ticker in STOCK_TICKERS:
     #         place_market_order(BUY, ticker, trade_size)
  
-def process_tenders():
-    """Checks for tenders and accepts profitable ones, then offloads ETF positions."""
-    tenders = get_tenders()
+def passive_arbitrage(signal, eq_joy_c, trade_size):
+    """Keep resting entry/exit quotes while the signal lasts, pull them when it goes away."""
+    if signal == 0:
+        order_queue.cancel_quotes()
+        return
  
-    # No tenders available
-    if not tenders:
-        return  
+    action = BUY if signal > 0 else SELL
+    # entry and exit legs rest on both sides of ETF and stocks
+    if order_queue.check_limits(trade_size * 4, action):
+        order_queue.cancel_quotes()
+        return
  
-    for tender in tenders:
-        ticker = tender["ticker"]
-        action = tender["action"] 
-        price = tender["price"]
-        quantity = tender["quantity"]
+    stats = spread_stats["JOY_C"].snapshot(SIGNAL_WINDOW)
+    order_queue.joy_c_arb(action, eq_joy_c, trade_size, **stats)
  
-        # using market orders here so I only care about bid
+def evaluate_tender(tender):
+    """
+    Accepts a profitable tender and offloads the ETF position, or declines it.
+    Returns True once the tender is decided; False leaves it pending and the
+    tender watcher offers it again on its next poll.
+    """
+    decided_at = time.monotonic()
+    ticker = tender["ticker"]
+    action = tender["action"] 
+    price = tender["price"]
+    quantity = tender["quantity"]
+ 
+    # using market orders here so I only care about bid
+    if quote_bus is not None:
+        best_bid, _ = quote_bus.read()["quotes"][ticker]
+    else:
         best_bid, _ = get_bid_ask(ticker)
-        if not best_bid:
-            continue  # Skip if market data is unavailable
- 
-        if action == "BUY" and price < best_bid:
-            if order_queue.check_limits(quantity, action):
-                order_queue.offload_for_tender(action, quantity)
-                return
-            # make sure tender is still valid here
+    if not best_bid:
+        return False  # Skip if market data is unavailable
+ 
+    if action == "BUY" and price < best_bid:
+        if order_queue.check_limits(quantity, action):
+            order_queue.offload_for_tender(action, quantity)
+            return False
+        # make sure tender is still valid here
 
-            if accept_tender(tender):
-                print(f"🚀 Accepting BUY tender for {ticker}: {quantity} @ {price} (Market Bid: {best_bid})")
-                order_queue.offload_etf(ticker, "BUY", quantity, price)  # Offload position
- 
-        # Accept SELL tender if price is above current best ask
-        # can buy immediately at a profit 
-        elif action == "SELL" and price > best_bid:
-            if order_queue.check_limits(quantity, action):
-                order_queue.offload_for_tender(action, quantity)
-                return
-            # make sure tender is still valid here
+        if accept_tender(tender):
+            stamp_tender(tender, decided_at)
+            print(f"🚀 Accepting BUY tender for {ticker}: {quantity} @ {price} (Market Bid: {best_bid})")
+            order_queue.offload_etf(ticker, "BUY", quantity, price)  # Offload position
+            return True
+        return False
+ 
+    # Accept SELL tender if price is above current best ask
+    # can buy immediately at a profit 
+    elif action == "SELL" and price > best_bid:
+        if order_queue.check_limits(quantity, action):
+            order_queue.offload_for_tender(action, quantity)
+            return False
+        # make sure tender is still valid here
 
-            if accept_tender(tender):
-                print(f"🚀 Accepting SELL tender for {ticker}: {quantity} @ {price} (Market Bid: {best_bid})")
-                order_queue.offload_etf(ticker, "SELL", quantity, price)  # Offload position
-        else:
-            decline_tender(tender)
- 
- 
-def main():
-    global started 
-    while True:
-        update_rolling_prices()
-        print(started)
-        if started:
-            arbitrage()
-            process_tenders()
-            order_queue.update_orders()
-        time.sleep(CHECK_INTERVAL)
- 
-if __name__ == "__main__":
-    main()
- 
- 
- 
-# # === Matplotlib Real-time Graph ===
+        if accept_tender(tender):
+            stamp_tender(tender, decided_at)
+            print(f"🚀 Accepting SELL tender for {ticker}: {quantity} @ {price} (Market Bid: {best_bid})")
+            order_queue.offload_etf(ticker, "SELL", quantity, price)  # Offload position
+            return True
+        return False
+    else:
+        decline_tender(tender)
+        return True
  
-# # Initialize the figure and axes
-# fig, ax = plt.subplots(1, 2, figsize=(12, 6))
-# joy_c_plot, = ax[0].plot([], [], label="actual", color='blue')
-# eq_joy_c_plot, = ax[0].plot([], [], label="eq", color='red')
+def tender_expired(tender):
+    print(f"⌛ Tender {tender['tender_id']} for {tender['ticker']} expired before we could take it")
  
-# joy_u_plot, = ax[1].plot([], [], label="actual", color='blue')
-# eq_joy_u_plot, = ax[1].plot([], [], label="eq", color='red')
+# polls /tenders on its own cadence and hands only new (or still undecided) tenders to evaluate_tender
+tender_watcher = TenderWatcher(evaluate_tender, tender_expired)
  
-# ax[0].set_title("C")
-# ax[1].set_title("U")
-# for a in ax:
-#     a.set_xlabel("Time")
-#     a.set_ylabel("Price")
-#     a.legend()
+def stamp_tender(tender, decided_at):
+    # accept_tender reports the fill as order "tender-<id>", negative slippage is the edge we took
+    ticker = tender["ticker"]
+    mid = rolling_prices[ticker][-1] if rolling_prices[ticker] else None
+    executions.stamp(f"tender-{tender['tender_id']}", ticker, tender["action"], "tender", mid, decided_at)
  
+def prefill_rolling_prices(since_tick=None):
+    """
+    Seed the price windows and spread stats from the OHLC closes of the case so far,
+    or only from the ticks after `since_tick` when catching up from a checkpoint.
+    """
+    global started, exchange_rate
  
-# def update_plot(frame):
-#     """Fetches data and updates the plots dynamically."""
-#     if len(rolling_prices["JOY_C"]) < 2 or len(rolling_prices["JOY_U"]) < 2:
-#         return
+    closes = {}
+    for ticker in STOCK_TICKERS + ETF_TICKERS:
+        candles = ohlc_cache.history(ticker).recent(ROLLING_WINDOW_SIZE)
+        closes[ticker] = dict(zip(candles["tick"].tolist(), candles["close"].tolist()))
  
-#     # Get data for JOY_C and eq_joy_c
-#     x_data = list(range(len(rolling_prices["JOY_C"])))
-#     joy_c_plot.set_data(x_data, list(rolling_prices["JOY_C"]))
-#     eq_joy_c_plot.set_data(x_data, list(rolling_prices["eq_joy_c"]))
-#     ax[0].relim()
-#     ax[0].autoscale_view()
+    # only ticks every security has a candle for
+    ticks = sorted(set.intersection(*(set(c) for c in closes.values())))
+    if since_tick is not None:
+        ticks = [tick for tick in ticks if tick > since_tick]
+    if not ticks:
+        return
  
-#     # Get data for JOY_U and eq_joy_u
-#     x_data = list(range(len(rolling_prices["JOY_U"])))
-#     joy_u_plot.set_data(x_data, list(rolling_prices["JOY_U"]))
-#     eq_joy_u_plot.set_data(x_data, list(rolling_prices["eq_joy_u"]))
-#     ax[1].relim()
-#     ax[1].autoscale_view()
+    exchange_rate = get_exchange_rate()
+    for tick in ticks:
+        for ticker in STOCK_TICKERS + ETF_TICKERS:
+            rolling_prices[ticker].append(closes[ticker][tick])
+        eq_joy_c = sum(closes[t][tick] for t in STOCK_TICKERS)
+        rolling_prices["eq_joy_c"].append(eq_joy_c)
+        rolling_prices["eq_joy_u"].append(eq_joy_c / exchange_rate)
+        spread_stats["JOY_C"].update(eq_joy_c - closes["JOY_C"][tick])
+        spread_stats["JOY_U"].update(eq_joy_c / exchange_rate - closes["JOY_U"][tick])
+    started = True
+ 
+def save_checkpoint():
+    checkpoint.save(rolling_prices, tick_clock.tick(), started, order_queue.state())
+ 
+def restore_checkpoint(current_tick):
+    """Reload the last checkpoint of this case; returns its tick, or None if there is none."""
+    global started
+ 
+    saved = checkpoint.load()
+    if saved is None or saved["tick"] is None:
+        return None
+    if current_tick is not None and saved["tick"] > current_tick:
+        return None  # left over from an earlier case
+ 
+    for name, values in saved["windows"].items():
+        rolling_prices[name].extend(values.tolist())
+ 
+    # the windows cover the longest stats window, so replaying them rebuilds the stats
+    for etf, eq in (("JOY_C", "eq_joy_c"), ("JOY_U", "eq_joy_u")):
+        n = min(len(rolling_prices[etf]), len(rolling_prices[eq]))
+        for eq_value, etf_value in zip(list(rolling_prices[eq])[-n:], list(rolling_prices[etf])[-n:]):
+            spread_stats[etf].update(eq_value - etf_value)
+ 
+    order_queue.restore(saved["state"])
+    started = saved["started"]
+    print(f"♻ Restored checkpoint from tick {saved['tick']}: {len(order_queue.snapshot)} tracked orders")
+    return saved["tick"]
+ 
+def warm_up():
+    """Everything that can be done before the first trade, so trading starts at full speed."""
+    global quote_bus, recorder
+ 
+    order_queue.logger.install_signal_handlers()
+    atexit.register(export_executions)
+    if RECORD_SESSION:
+        recorder = SessionRecorder()
+    profiler.sample_stacks = PROFILE_STACKS
+    profiler.install_signal_handler()
+ 
+    if USE_QUOTE_BUS:
+        quote_bus, _ = start_market_data_process()
+        atexit.register(quote_bus.close)  # we own the segment: unlink it on the way out
+        order_queue.quote_bus = quote_bus
+        if SHOW_DASHBOARD:
+            start_dashboard_process(headless=HEADLESS_DASHBOARD)
+ 
+    print(f"🔌 {warm_up_connections()} API connections ready")
+    registry.load()  # fees, tick sizes and order limits, fetched once
+    tick_clock.start()
+ 
+    # pull the case's candle history for every ticker once, in parallel
+    ohlc_cache.prefill(current_tick=tick_clock.tick())
+    # after a restart, only the ticks missed since the checkpoint come from the candles
+    since_tick = restore_checkpoint(tick_clock.tick()) if WARM_RESTART else None
+    prefill_rolling_prices(since_tick)
+ 
+    # wait for the case to start
+    while not tick_clock.running or not tick_clock.tick():
+        time.sleep(0.05)
+        if not tick_clock.running:
+            tick_clock.sample()
+ 
+def update_accounting():
+    """Pick up fills we have not seen yet, mark to the latest mids and extend the P&L curve."""
+    global executions_exported
+ 
+    get_transacted_orders()
+    ledger.mark({ticker: prices[-1] for ticker, prices in rolling_prices.items() if prices}, exchange_rate)
+    ledger.record_tick(tick_clock.tick())
+ 
+    # case over: write the execution report once, it is rewritten at exit anyway
+    remaining = tick_clock.ticks_remaining()
+    if not executions_exported and remaining is not None and remaining <= 0:
+        export_executions()
+        executions_exported = True
+ 
+def export_executions():
+    if executions.records:
+        print(f"📊 Execution report written to {executions.export()}")
+ 
+def trading_allowed():
+    # safe mode: take no new risk while the API is degraded, only manage what we hold
+    return started and not api_degraded()
+ 
+def arbitrage_due():
+    return trading_allowed() and (not GATE_ON_CHANGES or arbitrage_inputs.consume())
+ 
+def stops_due():
+    """Stops only need checking when a quote or position moved, or orders were added or closed."""
+    global stops_snapshot
+    if not started:
+        return False
+    moved = stops_inputs.consume()
+    orders_changed = order_queue.snapshot is not stops_snapshot
+    stops_snapshot = order_queue.snapshot
+    return not GATE_ON_CHANGES or moved or orders_changed
  
-#     return joy_c_plot, eq_joy_c_plot, joy_u_plot, eq_joy_u_plot
+def main():
+    warm_up()
+ 
+    runtime = TaskRuntime()
+    runtime.add("update_rolling_prices", update_rolling_prices, MARKET_INTERVAL, MARKET_PRIORITY)
+    runtime.add("update_orders", order_queue.update_orders, STOPS_INTERVAL, STOPS_PRIORITY,
+                when=stops_due)
+    runtime.add("tender_watcher", tender_watcher.poll, TENDERS_INTERVAL, TENDERS_PRIORITY,
+                when=trading_allowed)
+    runtime.add("arbitrage", arbitrage, ARBITRAGE_INTERVAL, ARBITRAGE_PRIORITY,
+                when=arbitrage_due)
+    runtime.add("accounting", update_accounting, ACCOUNTING_INTERVAL, ACCOUNTING_PRIORITY,
+                when=lambda: started)
+    runtime.add("checkpoint", save_checkpoint, CHECKPOINT_INTERVAL, CHECKPOINT_PRIORITY,
+                when=lambda: started)
+    runtime.run()
  
+if __name__ == "__main__":
+    main()
  
-# # Use threading to run the trading logic separately
-# trading_thread = threading.Thread(target=main, daemon=True)
-# trading_thread.start()
  
-# # Animate the graph
-# ani = animation.FuncAnimation(fig, update_plot, interval=500)
  
-# plt.show()
+# === Real-time Graph ===
+# The live chart runs in its own process (see dashboard.py) and reads the
+# quote bus, so drawing never competes with the trading loop for the GIL.
+# Set SHOW_DASHBOARD = True, or run `python dashboard.py [--headless]`
+# while the bot is running.
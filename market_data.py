@@ -0,0 +1,196 @@
+import time
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from networking import *
+from tick_clock import tick_clock
+from request_scheduler import REQUESTS_PER_SECOND, MARKET_DATA_RATE, MARKET_DATA_CLASSES
+
+# Quote bus layout (all float64 so one ndarray can view the whole segment):
+#   [0] sequence number (odd while the writer is mid-update)
+#   [1] tick
+#   [2] CAD/USD exchange rate
+#   then one row per ticker of (bid, ask, position, last)
+BUS_TICKERS = STOCK_TICKERS + ETF_TICKERS
+HEADER_SIZE = 3
+FIELDS = 4
+BID, ASK, POSITION, LAST = range(FIELDS)
+BUS_SIZE = HEADER_SIZE + FIELDS * len(BUS_TICKERS)
+BUS_NAME = "ritc_quote_bus"
+
+# seconds between polls in the market-data process; 5 polls/s leaves room in MARKET_DATA_RATE for /case
+MARKET_DATA_INTERVAL = 0.2
+
+
+class QuoteBus:
+    """Top-of-book, positions, FX and tick in shared memory, guarded by a seqlock."""
+
+    def __init__(self, name=BUS_NAME, create=False):
+        if create:
+            try:
+                # a crashed previous run can leave the segment behind
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=BUS_SIZE * 8)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.name = name
+        self.owner = create
+        self.buf = np.ndarray((BUS_SIZE,), dtype=np.float64, buffer=self.shm.buf)
+        self.rows = self.buf[HEADER_SIZE:].reshape(len(BUS_TICKERS), FIELDS)
+        if create:
+            self.buf[:] = np.nan
+            self.buf[0] = 0
+
+    def publish(self, tick, fx, rows):
+        """Writer side: only the market-data process calls this."""
+        self.buf[0] += 1  # odd -> readers retry
+        self.buf[1] = tick
+        self.buf[2] = fx
+        self.rows[:] = rows
+        self.buf[0] += 1  # even -> consistent
+
+    def read(self):
+        """Lock-free read, retried until a consistent copy is seen."""
+        while True:
+            seq = self.buf[0]
+            if seq % 2:
+                continue
+            data = self.buf.copy()
+            if self.buf[0] == seq:
+                break
+
+        rows = data[HEADER_SIZE:].reshape(len(BUS_TICKERS), FIELDS)
+        quotes, positions, last = {}, {}, {}
+        for i, ticker in enumerate(BUS_TICKERS):
+            bid, ask = rows[i, BID], rows[i, ASK]
+            # RIT reports 0 when one side of the book is empty
+            if bid > 0 and ask > 0:
+                quotes[ticker] = (float(bid), float(ask))
+            else:
+                quotes[ticker] = (None, None)
+            positions[ticker] = 0 if np.isnan(rows[i, POSITION]) else int(rows[i, POSITION])
+            last[ticker] = float(rows[i, LAST])
+
+        return {
+            "seq": int(data[0]),
+            "tick": None if np.isnan(data[1]) else int(data[1]),
+            "fx": 1.0 if np.isnan(data[2]) else float(data[2]),
+            "quotes": quotes,
+            "positions": positions,
+            "last": last,
+        }
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ChangeFlag:
+    """Set whenever one of the watched tickers moves; consume() reads and clears it."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.event.set()  # the first run always goes ahead
+
+    def __call__(self, diff):
+        self.event.set()
+
+    def consume(self):
+        if not self.event.is_set():
+            return False
+        self.event.clear()
+        return True
+
+
+class QuoteChanges:
+    """
+    Keeps the last (bid, ask, position) per ticker and turns each new snapshot
+    into a compact diff of only the tickers that moved. Subscribers register
+    the tickers they depend on and are called with the part of the diff that
+    concerns them, so stages can skip work while their inputs stand still.
+    """
+
+    def __init__(self):
+        self.last = {}
+        self.subscribers = []  # (set of tickers, callback)
+        self.lock = threading.Lock()
+
+    def subscribe(self, tickers, callback=None):
+        """Register callback(diff) for `tickers`; without a callback a ChangeFlag is returned."""
+        callback = callback or ChangeFlag()
+        with self.lock:
+            self.subscribers.append((set(tickers), callback))
+        return callback
+
+    def update(self, quotes, positions=None):
+        """quotes: ticker -> (bid, ask). Returns ticker -> (bid, ask, position) for what changed."""
+        positions = positions or {}
+        diff = {}
+        with self.lock:
+            for ticker, (bid, ask) in quotes.items():
+                state = (bid, ask, positions.get(ticker))
+                if self.last.get(ticker) != state:
+                    self.last[ticker] = state
+                    diff[ticker] = state
+            subscribers = list(self.subscribers)
+
+        if diff:
+            for tickers, callback in subscribers:
+                moved = {t: diff[t] for t in tickers if t in diff}
+                if moved:
+                    callback(moved)
+        return diff
+
+
+def poll_market_data(bus):
+    """One poll of the exchange: /securities already carries bid, ask, position and last."""
+    securities = get_securities()
+    if not securities:
+        return False
+
+    fx = securities.get("last", "USD", np.nan)
+    rows = np.full((len(BUS_TICKERS), FIELDS), np.nan)
+    for i, ticker in enumerate(BUS_TICKERS):
+        j = securities.index.get(ticker)
+        if j is not None:
+            rows[i] = (securities.bid[j], securities.ask[j], securities.position[j], securities.last[j])
+
+    tick = tick_clock.tick()
+    bus.publish(np.nan if tick is None else tick, fx, rows)
+    return True
+
+
+def run_market_data(name=BUS_NAME, interval=MARKET_DATA_INTERVAL):
+    """Entry point of the market-data process."""
+    # this process only gets its slice of the API budget
+    current_account().scheduler.configure(MARKET_DATA_RATE, MARKET_DATA_CLASSES)
+    bus = QuoteBus(name)
+    tick_clock.start()  # this process's own clock; polls /case only to recalibrate
+    try:
+        while True:
+            start = time.monotonic()
+            poll_market_data(bus)
+            elapsed = time.monotonic() - start
+            if elapsed < interval:
+                time.sleep(interval - elapsed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.close()
+
+
+def start_market_data_process(name=BUS_NAME, interval=MARKET_DATA_INTERVAL):
+    """Create the bus and start the publisher; returns (bus, process)."""
+    # the publisher's slice of the per-second budget comes out of ours
+    current_account().scheduler.configure(REQUESTS_PER_SECOND - MARKET_DATA_RATE)
+    bus = QuoteBus(name, create=True)
+    process = mp.Process(target=run_market_data, args=(name, interval), daemon=True, name="market-data")
+    process.start()
+    return bus, process
@@ -1,55 +1,331 @@
 import requests
 import time
-
-# API Credentials
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from request_scheduler import RequestScheduler, classify
+from decoders import decode_securities, decode_book, decode_tenders, decode_orders, loads
+from resilience import Deadline, CircuitBreaker, backoff_delay
+
+# API Credentials of the default account
 API_KEY = 'BLDCD51J'
 BASE_URL = 'http://localhost:9939/v1'
 STOCK_TICKERS = ["SAD", "CRY", "ANGER", "FEAR"]
 ETF_TICKERS = ["JOY_C", "JOY_U"]
 
-def get_json(endpoint, params=None):
-    """Fetch API data with error handling."""
+# total time one call may take, retries included, per request class
+CALL_BUDGETS = {
+    "orders": 1.0,
+    "tenders": 0.5,
+    "book": 0.5,
+    "case": 0.5,
+    "securities": 0.5,
+    "history": 2.0,
+}
+CONNECT_TIMEOUT = 0.2
+POOL_SIZE = 16  # keep-alive connections kept open to the RIT client
+MAX_RETRIES = 3
+HEDGE_DELAY = 0.1  # send a duplicate of a hedged GET if the first is this slow
+HEDGE_WORKERS = 8  # two per hedged read in flight; only book and tender reads are hedged
+SLICE_WORKERS = 8  # child orders of one sliced order in flight at once
+
+_hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+# child orders of a sliced parent go out in parallel, each still rate limited
+_slice_pool = ThreadPoolExecutor(max_workers=SLICE_WORKERS, thread_name_prefix="slice")
+
+class Account:
+    """
+    One RIT trader ID. Each account has its own keep-alive pool, request
+    budget, circuit breaker, response cache, order listeners and ledger, so
+    one process can drive several traders without them throttling each other.
+    Every API function below runs against the current account (see use_account).
+    """
+
+    def __init__(self, name, api_key, base_url=BASE_URL, requests_per_second=None):
+        self.name = name
+        self.base_url = base_url
+        # keep-alive connections to the RIT client instead of a new socket per call
+        self.session = requests.Session()
+        self.session.headers["X-API-Key"] = api_key
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+        # trips when the API keeps failing; main() trades in safe mode while it is open
+        self.breaker = CircuitBreaker()
+        # shares the per-second API budget between endpoints by priority
+        self.scheduler = RequestScheduler(rate=requests_per_second) if requests_per_second else RequestScheduler()
+        # (endpoint, params) -> (monotonic time fetched, response) for reads we may defer
+        self.response_cache = {}
+        # callbacks called with every order payload we see (placements, lookups, order lists, tenders)
+        self.order_listeners = []
+        self._ledger = None
+
+    @property
+    def ledger(self):
+        """This account's accounting.Ledger, created and subscribed to its orders on first use."""
+        if self._ledger is None:
+            from accounting import Ledger  # accounting imports this module
+            self._ledger = Ledger()
+            self.order_listeners.append(self._ledger.on_order)
+        return self._ledger
+
+    def run(self, fn, *args, **kwargs):
+        """Call fn with this account current, e.g. as the target of a worker thread."""
+        with use_account(self):
+            return fn(*args, **kwargs)
+
+default_account = Account("default", API_KEY)
+accounts = {default_account.name: default_account}
+_current_account = contextvars.ContextVar("account", default=default_account)
+
+# the default account's state, under the names the rest of the bot already uses
+session = default_account.session
+breaker = default_account.breaker
+scheduler = default_account.scheduler
+order_listeners = default_account.order_listeners
+
+def add_account(name, api_key, base_url=BASE_URL, requests_per_second=None):
+    account = accounts[name] = Account(name, api_key, base_url, requests_per_second)
+    return account
+
+def current_account():
+    return _current_account.get()
+
+@contextmanager
+def use_account(account):
+    """Route the API calls made inside the block (in this thread or task) through `account`."""
+    if isinstance(account, str):
+        account = accounts[account]
+    token = _current_account.set(account)
+    try:
+        yield account
+    finally:
+        _current_account.reset(token)
+
+def _bind_account(fn):
+    """Wrap fn so pool workers run it against the caller's account, not the default."""
+    account = current_account()
+    return lambda *args: account.run(fn, *args)
+
+def _notify_order(order):
+    for listener in current_account().order_listeners:
+        listener(order)
+
+# key -> _Flight for GETs currently on the wire
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _cache_key(endpoint, params):
+    return current_account().name, endpoint, tuple(sorted(params.items())) if params else ()
+
+class _Flight:
+    """One in-flight GET that other callers can wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+def _single_flight(key, fetch):
+    """
+    Run fetch() unless an identical request is already in flight, in which
+    case wait for it and share its result. Works for threads, and for async
+    tasks that run the blocking call via asyncio.to_thread.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        return flight.result
+
+    try:
+        flight.result = fetch()
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        flight.done.set()
+    return flight.result
+
+def get_json(endpoint, params=None, decoder=None, hedge=False):
+    """
+    Fetch API data with error handling. Identical concurrent calls share one request.
+    A decoder turns the raw response bytes into something compact (see decoders.py);
+    without one the payload is parsed into plain Python objects.
+    hedge=True is for the few latency-critical reads (see _hedged_get).
+    """
+    key = _cache_key(endpoint, params) + (decoder.__name__ if decoder else None,)
+    return _single_flight(key, lambda: _fetch_json(endpoint, params, key, decoder, hedge))
+
+def _fetch_json(endpoint, params, key, decoder, hedge):
+    account = current_account()
+    scheduler, cache = account.scheduler, account.response_cache
+    request_class = classify(endpoint)
+
+    # low-priority reads give way to order flow if a recent enough copy exists
+    acquired = scheduler.acquire(request_class, block=False)
+    if not acquired:
+        cached = cache.get(key)
+        if cached and scheduler.fresh_enough(request_class, cached[0]):
+            return cached[1]
+
+    resp = api_request("GET", endpoint, params=params, hedge=hedge, acquired=acquired)
+    if resp is None:
+        return None
     try:
-        resp = requests.get(f"{BASE_URL}/{endpoint}", headers={"X-API-Key": API_KEY}, params=params)
         resp.raise_for_status()
-        return resp.json()
-    except requests.RequestException as e:
+        data = decoder(resp.content) if decoder else loads(resp.content)
+        cache[key] = (time.monotonic(), data)
+        return data
+    except (requests.RequestException, ValueError) as e:
         print(f"API Request failed: {e}")
         return None
-    
-    
+
+def api_degraded():
+    """True while the circuit breaker is open and the strategy should stay in safe mode."""
+    return current_account().breaker.is_open
+
+def _send(account, method, url, params, json, deadline):
+    return account.session.request(method, url, params=params, json=json,
+                                   timeout=(CONNECT_TIMEOUT, max(deadline.remaining(), 0.001)))
+
+def _hedged_get(account, url, params, deadline, request_class):
+    """Send a GET; if it has not answered within HEDGE_DELAY send a second one and take the first reply."""
+    first = _hedge_pool.submit(_send, account, "GET", url, params, None, deadline)
+    try:
+        return first.result(timeout=min(HEDGE_DELAY, deadline.remaining()))
+    except FutureTimeout:
+        pass
+    # the duplicate only goes out if the budget has a spare token for it
+    if deadline.expired() or not account.scheduler.acquire(request_class, block=False):
+        return first.result(timeout=deadline.remaining())
+
+    second = _hedge_pool.submit(_send, account, "GET", url, params, None, deadline)
+    end = time.monotonic() + deadline.remaining()
+    error = None
+    while time.monotonic() < end:
+        for future in (first, second):
+            if future.done():
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        if first.done() and second.done():
+            raise error
+        time.sleep(0.002)
+    raise requests.Timeout("hedged request ran out of time")
+
+def api_request(method, endpoint, params=None, json=None, budget=None,
+                retries=MAX_RETRIES, hedge=False, acquired=False):
+    """
+    Send one API call inside a deadline.
+
+    Retries with jittered backoff on rate limits, and on connection errors or
+    5xx for idempotent methods, but never past the deadline. Idempotent GETs
+    can be hedged. Returns the response (which may be an error response), or
+    None if the call failed outright or the circuit breaker is open.
+    """
+    account = current_account()
+    scheduler, breaker = account.scheduler, account.breaker
+    request_class = classify(endpoint)
+    deadline = Deadline(budget or CALL_BUDGETS[request_class])
+    idempotent = method in ("GET", "DELETE")
+    url = f"{account.base_url}/{endpoint}"
+
+    if not breaker.allow():
+        return None
+
+    resp = None
+    failed = False  # a request went out and the API (or the connection) failed it
+    for attempt in range(retries + 1):
+        # waiting for a local token counts against the deadline too
+        if not acquired and not scheduler.acquire(request_class, timeout=deadline.remaining()):
+            break
+        acquired = False
+        if deadline.expired():
+            break
+
+        resp = None
+        try:
+            if hedge and method == "GET":
+                resp = _hedged_get(account, url, params, deadline, request_class)
+            else:
+                resp = _send(account, method, url, params, json, deadline)
+        except (requests.RequestException, FutureTimeout) as e:
+            print(f"⚠ {method} {endpoint} failed: {e}")
+            failed = True
+            if not idempotent:
+                break  # a POST may have gone through, do not send it twice
+
+        if resp is not None:
+            if resp.status_code == 429:
+                try:
+                    wait = resp.json().get("wait", 0.01)
+                except ValueError:
+                    wait = 0.01
+                print(f"⚠ Rate limit exceeded on {endpoint}. Waiting {wait:.3f} seconds before retrying...")
+                scheduler.backoff(min(wait, deadline.remaining()))
+                continue
+            if resp.status_code < 500:
+                breaker.record_success()
+                return resp
+            failed = True
+            if not idempotent:
+                break  # a POST may have gone through, do not send it twice
+
+        time.sleep(backoff_delay(attempt, deadline))
+
+    if resp is not None and resp.status_code == 429:
+        breaker.record_success()  # being rate limited means the API is up, only busy
+    elif failed:
+        breaker.record_failure()
+    else:
+        breaker.cancel_probe()  # nothing reached the API: local throttling or the deadline
+    return resp
+
+def warm_up_connections(count=8):
+    """Open `count` pooled connections up front so the first trades don't pay for TCP setup."""
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        responses = list(pool.map(_bind_account(lambda _: api_request("GET", "case")), range(count)))
+    return sum(resp is not None and resp.ok for resp in responses)
+
 def post_json(endpoint, params=None):
     """Send a POST request to the API with error handling."""
+    resp = api_request("POST", endpoint, json=params)
     try:
-        resp = requests.post(
-            f"{BASE_URL}/{endpoint}",
-            headers={"X-API-Key": API_KEY, "Content-Type": "application/json"},
-            json=params
-        )
+        if resp is None:
+            return None
         resp.raise_for_status()
         return resp.json()
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"API Request failed: {e}")
         return None
 
 def delete_json(endpoint, params=None):
     """Send a DELETE request to the API with error handling."""
+    resp = api_request("DELETE", endpoint, json=params)
     try:
-        resp = requests.delete(
-            f"{BASE_URL}/{endpoint}",
-            headers={"X-API-Key": API_KEY, "Content-Type": "application/json"},
-            json=params
-        )
+        if resp is None:
+            return None
         resp.raise_for_status()
         return resp.json()
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"API Request failed: {e}")
         return None
 
 def accept_tender(tender):
     """Accept a tender by sending a POST request."""
     # If not accepted, it returns none
-    return post_json(f"tenders/{tender['tender_id']}")  # Corrected from GET to POST
+    result = post_json(f"tenders/{tender['tender_id']}")  # Corrected from GET to POST
+    if result:
+        # the tender fills in full at its price
+        _notify_order({
+            "order_id": f"tender-{tender['tender_id']}",
+            "ticker": tender["ticker"],
+            "action": tender["action"],
+            "quantity_filled": tender["quantity"],
+            "vwap": tender["price"],
+        })
+    return result
     
 def decline_tender(tender):
     """Accept a tender by sending a POST request."""
@@ -78,42 +354,46 @@ def get_current_tick():
         return None
 
 def get_order_book_depth(ticker):
-    order_book = get_json("securities/book", {"ticker": ticker, "limit": 1000})
+    order_book = get_json("securities/book", {"ticker": ticker, "limit": 1000}, decode_book)
     
     if order_book:
-        return len(order_book["bids"]) + len(order_book["asks"])
+        return order_book[2] + order_book[3]
     else:
         return None
 
 def get_recent_ohlc(ticker, limit=50):
-    ohlc = get_json("securities/history", {"ticker": ticker, "limit": limit})
+    """Last `limit` candles as an OHLC array (oldest first), served from the local history cache."""
+    from history_cache import ohlc_cache  # history_cache imports this module
+    ohlc = ohlc_cache.recent(ticker, limit)
 
-    if ohlc:
+    if len(ohlc):
         return ohlc
     else:
         return
 
 def get_vwap(ticker):
-    response = get_json("securities", {"ticker": ticker})
+    response = get_json("securities", {"ticker": ticker}, decode_securities)
 
     if response:
-        return response[0].get('vwap', None)
+        return response.get("vwap", ticker)
     else:
         return None
 
 def get_bid_ask(ticker):
     """Fetch the best bid and ask prices for a ticker."""
-    order_book = get_json("securities/book", {"ticker": ticker})
-    if order_book and order_book["bids"] and order_book["asks"]:
-        best_bid = max(order_book["bids"], key=lambda x: x["price"])["price"]
-        best_ask = min(order_book["asks"], key=lambda x: x["price"])["price"]
-        return best_bid, best_ask
+    order_book = get_json("securities/book", {"ticker": ticker}, decode_book, hedge=True)
+    if order_book and order_book[0] is not None and order_book[1] is not None:
+        return order_book[0], order_book[1]
     return None, None
 
+def get_securities():
+    """Fetch /securities as a compact decoders.Securities."""
+    return get_json("securities", decoder=decode_securities)
+
 def get_market_positions():
     """Fetch the current position of all non currency securities."""
-    positions = get_json("securities")
-    return {pos["ticker"]: pos["position"] for pos in positions if pos["ticker"] not in {"CAD", "USD"}} if positions else {}
+    securities = get_securities()
+    return securities.positions(exclude={"CAD", "USD"}) if securities else {}
 
 def get_position(ticker):
     return get_positions()[ticker]
@@ -126,114 +406,231 @@ def get_mid_price(ticker):
 
 def get_positions():
     """Fetch the current position for all securities."""
-    positions = get_json("securities")
-    return {pos["ticker"]: pos["position"] for pos in positions} if positions else {}
+    securities = get_securities()
+    return securities.positions() if securities else {}
 
 def get_exchange_rate():
     """Fetch the CAD/USD exchange rate."""
-    prices = get_json("securities")
-    for sec in prices:
-        if sec["ticker"] == "USD":
-            return sec["last"]
+    securities = get_securities()
+    if securities:
+        return securities.get("last", "USD", 1.0)
     return 1.0  # Default if not found
 
     
 def get_tenders():
-    tenders = get_json("tenders")  # Fetch active tenders
+    tenders = get_json("tenders", decoder=decode_tenders, hedge=True)  # Fetch active tenders
     return tenders
 
-def place_market_order(action, ticker, quantity, max_retries=3):
+def submit_order(action, ticker, quantity, price=None, max_retries=MAX_RETRIES):
+    """
+    Sends one MARKET order, or a LIMIT order when a price is given.
+    Returns the order payload from the exchange (with quantity_filled and vwap) or None.
+    """
     order_data = {
         "ticker": ticker,
-        "type": "MARKET",
+        "type": "MARKET" if price is None else "LIMIT",
         "quantity": quantity,
         "action": action,
     }
+    if price is not None:
+        order_data["price"] = price
 
-    for attempt in range(max_retries):
-        resp = requests.post(f"{BASE_URL}/orders", headers={"X-API-Key": API_KEY}, params=order_data)
+    # rate-limit retries happen inside api_request, within the orders deadline
+    resp = api_request("POST", "orders", params=order_data, retries=max_retries)
 
-        if resp.ok:
-            order_info = resp.json()  # Extract JSON response
-            order_id = order_info.get("order_id")
-            print(f"✅ MARKET {action} order placed: {quantity} {ticker} (Order ID: {order_id})")
-            return order_id  # Order was successfully placed
+    if resp is not None and resp.ok:
+        order_info = resp.json()  # Extract JSON response
+        _notify_order(order_info)
+        at_price = "" if price is None else f" for {price}"
+        print(f"✅ {order_data['type']} {action} order placed: {quantity} {ticker}{at_price} (Order ID: {order_info.get('order_id')})")
+        return order_info  # Order was successfully placed
+
+    if resp is None:
+        print(f"❌ Order for {ticker} not placed: API unavailable or deadline exceeded.")
+    elif resp.status_code == 429:
+        print(f"❌ Max retries reached. Order for {ticker} not placed.")
+    else:
+        print(f"❌ Order failed for {ticker}: {resp.text}")
+    return None
 
-        else:
-            error_data = resp.json()
-            error_code = error_data.get("code", "")
+def place_market_order(action, ticker, quantity, max_retries=MAX_RETRIES):
+    order_info = submit_order(action, ticker, quantity, max_retries=max_retries)
+    return order_info.get("order_id") if order_info else None
 
-            if error_code == "TOO_MANY_REQUESTS":
-                wait_time = error_data.get("wait", 0.01)  # Default to 10ms if no wait time is provided
-                print(f"⚠ Rate limit exceeded for {ticker}. Waiting {wait_time:.3f} seconds before retrying...")
-                time.sleep(wait_time)  # Pause before retrying
-            else:
-                print(f"❌ Order failed for {ticker}: {resp.text}")
-                return None  # Exit if error is not related to rate limits
+def place_limit_order(action, ticker, price, quantity):
+    """Places a limit order. security_registry.place_order picks market vs limit from the fees."""
+    order_info = submit_order(action, ticker, quantity, price)
+    return order_info.get("order_id") if order_info else None
 
-    print(f"❌ Max retries reached. Order for {ticker} not placed.")
-    return None  # If all retries fail, return None
+def slice_quantity(quantity, max_child):
+    """Child sizes for a parent quantity: as many full children as fit, then the rest."""
+    full, rest = divmod(int(quantity), int(max_child))
+    return [max_child] * full + ([rest] if rest else [])
 
-def place_limit_order(action, ticker, price, quantity):
-    """Places a market or limit order based on security transaction fees."""
-    order_data = {
+def place_sliced_order(action, ticker, quantity, price=None, max_child=None):
+    """
+    Places a parent order of any size: splits it into child orders within the
+    security's per-order maximum, sends them concurrently (each child still
+    waits for its own token from the request scheduler) and aggregates the
+    fills. MARKET children, or LIMIT children at `price` when one is given.
+
+    Returns {"ticker", "action", "quantity", "quantity_filled", "vwap",
+    "order_ids", "children", "unplaced"}: children pairs each placed order id
+    with its size, unplaced is the quantity no child got on.
+    """
+    if max_child is None:
+        from security_registry import registry  # security_registry imports this module
+        max_child = registry.child_size(ticker)
+    sizes = slice_quantity(quantity, max_child) if quantity > 0 else []
+
+    submit = _bind_account(lambda size: submit_order(action, ticker, size, price))
+    if len(sizes) > 1:
+        children = list(_slice_pool.map(submit, sizes))
+    else:
+        children = [submit(size) for size in sizes]
+
+    placed, filled, notional, unplaced = [], 0, 0.0, 0
+    for size, child in zip(sizes, children):
+        if child is None:
+            unplaced += size
+            continue
+        placed.append((child.get("order_id"), size))
+        child_filled = child.get("quantity_filled") or 0
+        if child_filled and child.get("vwap") is not None:
+            filled += child_filled
+            notional += child_filled * child["vwap"]
+
+    return {
         "ticker": ticker,
-        "type": "LIMIT",
-        "quantity": quantity,
         "action": action,
-        "price": price
+        "quantity": quantity,
+        "quantity_filled": filled,
+        "vwap": notional / filled if filled else None,
+        "order_ids": [order_id for order_id, _ in placed],
+        "children": placed,
+        "unplaced": unplaced,
     }
 
-    resp = requests.post(f"{BASE_URL}/orders", headers={"X-API-Key": API_KEY}, params=order_data)
+def get_orders():
+    """Fetches active orders from the API and returns them as a list."""
+    return _single_flight(_cache_key("orders", None), _fetch_orders)
+
+def _fetch_orders():
+    resp = api_request("GET", "orders")
+    if resp is None:
+        print(f"❌ Error while fetching orders")
+        return None
 
     if resp.ok:
-        order_info = resp.json()  # Extract JSON response
-        order_id = order_info.get("order_id")
-        print(f"✅ LIMIT {action} order placed: {quantity} {ticker} for {price} (Order ID: {order_id})")
-        return order_id
+        orders = decode_orders(resp.content)  # Return the list of orders
+        for order in orders:
+            _notify_order(order)
+        return orders
     else:
-        print(f"⚠ Order failed: {resp.text}")
+        print(f"⚠ Failed to fetch orders: {resp.text}")
         return None
 
-def get_orders():
-    """Fetches active orders from the API and returns them as a list."""
-    try:
-        resp = requests.get(f"{BASE_URL}/orders", headers={"X-API-Key": API_KEY})
-
-        if resp.ok:
-            return resp.json()  # Return the list of orders
-        else:
-            print(f"⚠ Failed to fetch orders: {resp.text}")
-            return None
-    except requests.RequestException as e:
-        print(f"❌ Error while fetching orders: {e}")
-        return None
+def get_transacted_orders():
+    """Fetches filled orders; their fills reach the order listeners."""
+    orders = get_json("orders", {"status": "TRANSACTED"}, decode_orders)
+    for order in orders or ():
+        _notify_order(order)
+    return orders
 
 def get_order(id, verbose=True):
     """Fetches active orders from the API and returns them as a list."""
-    try:
-        resp = requests.get(f"{BASE_URL}/orders/{id}", headers={"X-API-Key": API_KEY})
+    return _single_flight(_cache_key(f"orders/{id}", None), lambda: _fetch_order(id, verbose))
 
-        if resp.ok:
-            return resp.json()  # Return the order
-        else:
-            if verbose:
-                print(f"⚠ Failed to fetch orders: {resp.text}")
-            return None
-    except requests.RequestException as e:
-        print(f"❌ Error while fetching order: {e}")
+def _fetch_order(id, verbose):
+    resp = api_request("GET", f"orders/{id}")
+    if resp is None:
+        print(f"❌ Error while fetching order {id}")
+        return None
+
+    if resp.ok:
+        order = resp.json()  # Return the order
+        _notify_order(order)
+        return order
+    else:
+        if verbose:
+            print(f"⚠ Failed to fetch orders: {resp.text}")
         return None
 
 def delete_order(id):
     """Fetches active orders from the API and returns them as a list."""
-    try:
-        resp = requests.delete(f"{BASE_URL}/orders/{id}", headers={"X-API-Key": API_KEY})
+    resp = api_request("DELETE", f"orders/{id}")
+    if resp is None:
+        print(f"❌ Error while deleting order {id}")
+        return False
+
+    if resp.ok:
+        return True
+    else:
+        print(f"⚠ Failed to fetch orders: {resp.text}")
+        return False
+
+def cancel_orders(ids=None, ticker=None, price_range=None, query=None):
+    """
+    Cancels many open orders in one round trip with POST /commands/cancel.
 
-        if resp.ok:
-            return True
+    Pass either a list of order ids, or any mix of a ticker, a (low, high) price
+    range and a raw RIT query string, which are ANDed together. Falls back to
+    concurrent delete_order calls if the bulk command fails, except for a raw
+    query, which can't be evaluated locally and cancels nothing then.
+    Returns the list of cancelled order ids.
+    """
+    ids = list(ids) if ids is not None else None
+    if ids is not None and (ticker is not None or price_range is not None or query is not None):
+        raise ValueError("cancel_orders takes either ids or filters, not both")
+    if ids is not None and not ids:
+        return []
+
+    params = {}
+    if ids is not None:
+        params["ids"] = ",".join(str(order_id) for order_id in ids)
+    clauses = []
+    if ticker is not None:
+        if price_range is None and query is None:
+            params["ticker"] = ticker
         else:
-            print(f"⚠ Failed to fetch orders: {resp.text}")
-            return False
-    except requests.RequestException as e:
-        print(f"❌ Error while fetching order: {e}")
-        return False
\ No newline at end of file
+            clauses.append(f"Ticker='{ticker}'")
+    if price_range is not None:
+        low, high = price_range
+        clauses.append(f"Price>={low} AND Price<={high}")
+    if query is not None:
+        clauses.append(query)
+    if clauses:
+        params["query"] = " AND ".join(clauses)
+    if not params:
+        params["all"] = 1
+
+    resp = api_request("POST", "commands/cancel", params=params)
+    if resp is not None and resp.ok:
+        cancelled = resp.json().get("cancelled_order_ids", [])
+        print(f"🧹 Cancelled {len(cancelled)} orders")
+        return cancelled
+    reason = resp.text if resp is not None else "no response"
+    if query is not None:
+        # never widen a cancel we can't reproduce locally
+        print(f"⚠ Bulk cancel failed, nothing cancelled for query {query!r}: {reason}")
+        return []
+    print(f"⚠ Bulk cancel failed, cancelling one by one: {reason}")
+
+    if ids is None:
+        orders = get_orders() or []
+        ids = [
+            order["order_id"] for order in orders
+            if order["status"] == "OPEN"
+            and (ticker is None or order["ticker"] == ticker)
+            and (price_range is None or price_range[0] <= (order["price"] or 0) <= price_range[1])
+        ]
+    return cancel_orders_concurrently(ids)
+
+def cancel_orders_concurrently(ids):
+    """One DELETE per order, all in flight at once. Returns the ids that were cancelled."""
+    ids = list(ids)
+    if not ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(ids), 8)) as pool:
+        results = list(pool.map(_bind_account(delete_order), ids))
+    return [order_id for order_id, ok in zip(ids, results) if ok]
@@ -1,8 +1,13 @@
 from networking import *
 import time
 from file_logger import FileLogger
+from resilience import Deadline, backoff_delay
+from tick_clock import tick_clock
+from security_registry import registry, place_order
 import numpy as np
 import statistics
+import itertools
+import threading
  
 MAX_LONG_EXPOSURE = 300_000
 MAX_SHORT_EXPOSURE = 200_000
@@ -10,26 +15,106 @@ SELL = "SELL"
 BUY = "BUY"
 ALPHA = 1
 ORDER_SIZE = 1_000
+ORDER_LOOKUP_BUDGET = 2.0  # seconds return_order_id waits for a new order to appear
+ 
+ 
+class OrderRecord:
+    """One tracked order. Slotted so thousands of them stay small and attribute access stays fast."""
+    __slots__ = ("order_id", "ticker", "action", "type", "price", "quantity",
+                 "quantity_filled", "status", "stop_loss")
+ 
+    def __init__(self, order_id, ticker, action, price, quantity, stop_loss,
+                 type="MARKET", quantity_filled=0, status="OPEN"):
+        self.order_id = order_id
+        self.ticker = ticker
+        self.action = action
+        self.type = type
+        self.price = price
+        self.quantity = quantity
+        self.quantity_filled = quantity_filled
+        self.status = status
+        self.stop_loss = stop_loss
+ 
+    @property
+    def remaining(self):
+        return self.quantity - self.quantity_filled
+ 
+    def update_from(self, order_rit):
+        """Refresh the exchange-owned fields from a GET /orders/{id} response."""
+        self.quantity = order_rit["quantity"]
+        self.quantity_filled = order_rit["quantity_filled"]
+        self.status = order_rit["status"]
+        self.type = order_rit["type"]
+        if order_rit.get("price") is not None:
+            self.price = order_rit["price"]
+ 
+    def __repr__(self):
+        return (f"OrderRecord({self.order_id}, {self.action} {self.quantity} {self.ticker} "
+                f"@ {self.price}, stop {self.stop_loss}, {self.status})")
+ 
  
 class OrderQueue:
     logger = FileLogger("order_queue.log")
  
-    def __init__(self):
+    def __init__(self, rolling_prices=None):
         """Initialize order queue and inventory tracking."""
-        self.queue = []
+        # main.py's dict of mid-price deques, used to price limit orders and stops
+        self.rolling_prices = rolling_prices
+        # resting arbitrage quotes: (leg, ticker, action) -> OrderRecord
+        self.resting = {}
+        # legs whose resting order left the book (filled) since quoting started
+        self.filled_legs = set()
+        # leg -> shares filled by its earlier orders that were re-priced away
+        self.leg_filled = {}
+        # order_id -> OrderRecord, plus secondary indexes of order ids
+        self.queue = {}
+        self.by_ticker = {ticker: set() for ticker in STOCK_TICKERS + ETF_TICKERS}
+        self.by_side = {BUY: set(), SELL: set()}
+        # trades we track without an exchange order (e.g. tender fills) get negative ids
+        self.local_ids = itertools.count(-1, -1)
         self.trade_log = []
+        # shared-memory quote bus, set by main() when the market-data process runs
+        self.quote_bus = None
+        # execution.ExecutionTracker, set by main() so stop-outs show up in the slippage stats
+        self.executions = None
+ 
+        # writers hold self.lock only while touching the dicts and indexes, then publish
+        # an immutable tuple of records; readers use self.snapshot and never take a lock
+        self.lock = threading.RLock()
+        self.snapshot = ()
+        # stop-loss evaluation and reconciliation of one ticker never run twice at once
+        self.ticker_locks = {ticker: threading.Lock() for ticker in STOCK_TICKERS + ETF_TICKERS}
+        # one re-quote at a time
+        self.quote_lock = threading.Lock()
+ 
  
  
  
+    def stamp(self, order_id, ticker, action, strategy, decided_at):
+        if self.executions is not None and self.rolling_prices[ticker]:
+            self.executions.stamp(order_id, ticker, action, strategy,
+                                  self.rolling_prices[ticker][-1], decided_at)
+ 
+    def market_positions(self):
+        """Positions from the quote bus when available, otherwise from the API."""
+        if self.quote_bus is not None:
+            return self.quote_bus.read()["positions"]
+        return get_market_positions()
+
+    def market_quotes(self):
+        """ticker -> (bid, ask) from the quote bus when available, otherwise six book requests."""
+        if self.quote_bus is not None:
+            return self.quote_bus.read()["quotes"]
+        return get_all_bid_ask()
  
     def check_gross_limit(self, trade_size):
-        positions = get_market_positions()
+        positions = self.market_positions()
         gross_exposure = sum(abs(v) for v in positions.values())
         return gross_exposure + trade_size > MAX_LONG_EXPOSURE
  
     # returns true if over limit with order
     def check_net_limit(self, trade_size, action):
-        positions = get_market_positions()
+        positions = self.market_positions()
         net_exposure = sum(positions.values())
  
         # make sure net limit checks the correct inequality based on the action
@@ -40,16 +125,7 @@ class OrderQueue:
             return net_exposure + trade_size > MAX_SHORT_EXPOSURE
  
     def offload_etf(self, ticker, action_performed, quantity, price):
-        # if action_performed == BUY:
-        #     while quantity > 0:
-        #         trade_size = min(10_000, quantity)
-        #         place_market_order(SELL, ticker, trade_size)
-        #         quantity -= trade_size
-        # if action_performed == SELL:
-        #     while quantity > 0:
-        #         trade_size = min(10_000, quantity)
-        #         place_market_order(BUY, ticker, trade_size)
-        #         quantity -= trade_size
+        # place_sliced_order(SELL if action_performed == BUY else BUY, ticker, quantity)
         # diff = ALPHA * abs(bid-price)
         stop_loss = None
 
@@ -60,22 +136,29 @@ class OrderQueue:
         
         self.add_trade(ticker, price, action_performed, quantity, stop_loss)
  
-    def return_order_id(self, order_id):
-        while True:
+    def return_order_id(self, order_id, budget=ORDER_LOOKUP_BUDGET):
+        """Poll for a freshly placed order until it shows up, giving up after `budget` seconds."""
+        deadline = Deadline(budget)
+        start_time = time.time()
+        attempt = 0
+        while not deadline.expired():
             order_status = get_order(order_id, False)
  
-            start_time = time.time()
             if order_status is None:
                 if not order_id:
                     print(f"What")
                 print(f"⚠ Order not found yet ({order_id}), retrying...")
-                time.sleep(0.1)  # Wait half a second before retrying
+                time.sleep(max(backoff_delay(attempt, deadline), 0.01))
+                attempt += 1
             else:
                 end_time = time.time()
                 delay = end_time - start_time
                 self.print(f"✅ Order {order_id} recognized after {delay:.2f} seconds.")
                 return order_status
  
+        self.print(f"❌ Order {order_id} not recognized after {budget:.2f} seconds.")
+        return None
+ 
  
     # def add_trade(self, ticker, price, action, id, z_mean, z):
     #     order = self.return_order_id(id)
@@ -92,16 +175,85 @@ class OrderQueue:
  
     #     self.queue[id] = order
 
-    def add_trade(self, ticker, price, action, quantity, stop_loss):
-        order = {
-            "ticker": ticker,
-            "price": price,
-            "action": action,
-            "quantity": quantity,
-            "stop/loss": stop_loss
-        }
+    def add_trade(self, ticker, price, action, quantity, stop_loss, order_id=None):
+        with self.lock:
+            if order_id is None:
+                order_id = next(self.local_ids)
+ 
+            order = OrderRecord(order_id, ticker, action, price, quantity, stop_loss)
+            self.queue[order_id] = order
+            self.by_ticker.setdefault(ticker, set()).add(order_id)
+            self.by_side[action].add(order_id)
+            self.publish()
+        return order
+ 
+    def remove_order(self, order_id):
+        with self.lock:
+            order = self.queue.pop(order_id, None)
+            if order is not None:
+                self.by_ticker[order.ticker].discard(order_id)
+                self.by_side[order.action].discard(order_id)
+                self.publish()
+        return order
+ 
+    def state(self):
+        """Plain-data copy of what a restart needs: tracked orders, resting quotes, filled legs."""
+        def fields(order):
+            return {slot: getattr(order, slot) for slot in OrderRecord.__slots__}
+        # resting quotes and legs change under quote_lock (requote / cancel_resting), the queue under lock
+        with self.quote_lock, self.lock:
+            return {
+                "orders": [fields(order) for order in self.queue.values()],
+                "resting": [[*key, fields(order)] for key, order in self.resting.items()],
+                "filled_legs": [list(key) for key in self.filled_legs],
+                "leg_filled": [[*key, filled] for key, filled in self.leg_filled.items()],
+            }
  
-        self.queue.append(order)
+    def restore(self, state):
+        """Load what state() returned before a restart."""
+        with self.quote_lock, self.lock:
+            for fields in state.get("orders", []):
+                order = OrderRecord(**fields)
+                self.queue[order.order_id] = order
+                self.by_ticker.setdefault(order.ticker, set()).add(order.order_id)
+                self.by_side[order.action].add(order.order_id)
+            for leg, ticker, action, fields in state.get("resting", []):
+                self.resting[(leg, ticker, action)] = OrderRecord(**fields)
+            self.filled_legs.update(tuple(key) for key in state.get("filled_legs", []))
+            for leg, ticker, action, filled in state.get("leg_filled", []):
+                self.leg_filled[(leg, ticker, action)] = filled
+ 
+            # new local ids continue below the restored ones
+            lowest = min((i for i in self.queue if isinstance(i, int)), default=0)
+            self.local_ids = itertools.count(min(lowest, 0) - 1, -1)
+            self.publish()
+ 
+    def publish(self):
+        # called with self.lock held; swapping the reference is atomic for readers
+        self.snapshot = tuple(self.queue.values())
+ 
+    def ticker_lock(self, ticker):
+        lock = self.ticker_locks.get(ticker)
+        if lock is None:
+            with self.lock:
+                lock = self.ticker_locks.setdefault(ticker, threading.Lock())
+        return lock
+ 
+    def get_order(self, order_id):
+        return self.queue.get(order_id)
+ 
+    def orders_for(self, ticker=None, action=None):
+        """Orders matching a ticker and/or side, looked up through the indexes."""
+        if ticker is None and action is None:
+            return list(self.snapshot)
+        with self.lock:
+            if ticker is None:
+                ids = self.by_side[action]
+            elif action is None:
+                ids = self.by_ticker.get(ticker, ())
+            else:
+                ids = self.by_ticker.get(ticker, set()) & self.by_side[action]
+            return [self.queue[order_id] for order_id in ids]
  
     def calculate_stop_loss(self, ticker, action, z, z_mean, price):
         if ticker in ETF_TICKERS:
@@ -127,130 +279,137 @@ class OrderQueue:
  
     def place_all_market_orders(self, action, trade_size):
         for ticker in ["SAD", "ANGER", "FEAR", "CRY"]:
-            place_market_order(action, ticker, trade_size // 4)
+            place_sliced_order(action, ticker, trade_size // 4)
  
     def place_all_limit_orders(self, action, trade_size, z_mean, z):
         for ticker in ["SAD", "ANGER", "FEAR", "CRY"]:
             price = self.rolling_prices[ticker][-1]
-            order_id = place_limit_order(action, ticker, price, trade_size // 4)
-            self.add_trade(ticker, price, action, order_id, z_mean, z)
+            result = place_sliced_order(action, ticker, trade_size // 4, price)
+            stop_loss = self.calculate_stop_loss(ticker, action, z, z_mean, price)
+            for order_id, quantity in result["children"]:
+                self.add_trade(ticker, price, action, quantity, stop_loss, order_id)
  
     # i want to BUY/SELL joy_c and do the reverse for the stocks
     # this is the break even point, I offload my shares here
     def joy_c_arb(self, action_for_joy, eq_joy_c, quantity, z_mean, sigma, z_sd, z):
+        """
+        Passive version of the JOY_C arbitrage: rest limit orders instead of crossing the spread.
+ 
+        Entry legs sit at the current mids (ETF one way, each stock the other way).
+        Exit legs sit where the spread z = eq_joy_c - JOY_C is back at its mean z_mean,
+        with the stocks taking their share of the move by weight. Calling this every
+        tick re-prices the quotes, and only legs whose price actually moved are touched.
+        """
+        other = SELL if action_for_joy == BUY else BUY
+        joy_c_mid = self.rolling_prices["JOY_C"][-1]
+        gap = z - z_mean  # how far the ETF has to move to be back at the mean spread
+ 
+        targets = {
+            ("entry", "JOY_C", action_for_joy): (joy_c_mid, quantity),
+            ("exit", "JOY_C", other): (eq_joy_c - z_mean, quantity),
+        }
+        for ticker in STOCK_TICKERS:
+            mid = self.rolling_prices[ticker][-1]
+            share = mid / eq_joy_c
+            targets[("entry", ticker, other)] = (mid, quantity)
+            # if the stocks do the converging they move against the ETF's direction
+            if action_for_joy == BUY:
+                targets[("exit", ticker, action_for_joy)] = (mid - share * gap, quantity)
+            else:
+                targets[("exit", ticker, action_for_joy)] = (mid + share * gap, quantity)
+ 
+        self.requote(targets, z, z_mean)
+ 
+    def requote(self, targets, z, z_mean):
+        """Bring resting orders in line with `targets`: {(leg, ticker, action): (price, quantity)}."""
+        with self.quote_lock:
+            self._requote(targets, z, z_mean)
+ 
+    def _requote(self, targets, z, z_mean):
+        open_orders = self.open_orders()
+ 
+        for key, order in list(self.resting.items()):
+            if open_orders is None:
+                break
+            payload = open_orders.get(order.order_id)
+            if payload is None:
+                # off the book: filled in full (or cancelled), the leg is done
+                del self.resting[key]
+                self.remove_order(order.order_id)
+                self.filled_legs.add(key)
+            else:
+                order.update_from(payload)  # picks up partial fills
  
-        if action_for_joy == SELL:
-            price_etf_sold, price_etf_bought = None, None
-            price_stocks_sold = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            price_stocks_bought = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
- 
-            # sell ETF at current price (minus a bit)
-            price_etf_sold = self.rolling_prices["JOY_C"][-1]
-            id_etf = place_limit_order(SELL, "JOY_C", price_etf_sold, quantity)
-            assert(id_etf is not None)
- 
-            # buy stocks at current price (plus a bit)
-            id_1 = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            for ticker in ["SAD", "ANGER", "FEAR", "CRY"]:
-                price = self.rolling_prices[ticker][-1]
-                price_stocks_bought[ticker] = price
-                id_1[ticker] = place_limit_order(BUY, ticker, price_stocks_bought[ticker], quantity // 4)
-                assert(id_1[ticker] is not None)
-                self.add_trade(ticker, price_stocks_bought[ticker], BUY, id_1[ticker], z_mean, z)
- 
-            # add trades to queue
-            self.add_trade("JOY_C", price_etf_sold, SELL, id_etf, z_mean, z)
- 
- 
-            # buy back ETF at equilibrium price
-            price_etf_bought = eq_joy_c + z_mean
-            id_etf = place_limit_order(BUY, "JOY_C", price_etf_bought, quantity)
-            assert(id_etf is not None)
- 
-            # sell shares at equilibrium price
-            id_2 = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            for ticker in STOCK_TICKERS:
-                percentage = self.rolling_prices[ticker][-1] / (eq_joy_c + z_mean)
-                price_stocks_sold[ticker] = percentage * (eq_joy_c + z_mean)
- 
-                id_2[ticker] = place_limit_order(SELL, ticker, price_stocks_sold[ticker], quantity // 4)
-                # add here because it's easier
-                self.add_trade(ticker, price_stocks_sold[ticker], SELL, id_2[ticker], z_mean, z)
-                assert(id_2[ticker] is not None)
- 
-            # add trades to queue
-            self.add_trade("JOY_C", price_etf_bought, BUY, id_etf, z_mean, z)
- 
-            assert(price_etf_bought < price_etf_sold)
-            for ticker in STOCK_TICKERS:
-                assert(price_stocks_bought[ticker] < price_stocks_sold[ticker])
+        stale = []
+        to_place = []
+        for key, (price, quantity) in targets.items():
+            if key in self.filled_legs:
+                continue
+            info = registry.info(key[1])
+            price = info.round_price(price)
+            # what the leg still needs after the orders we already re-priced away
+            quantity -= self.leg_filled.get(key, 0)
+            order = self.resting.get(key)
+            if order is not None:
+                # quotes that move less than one price increment are left alone
+                # (both are on the tick grid, so anything under half a tick is float noise)
+                if abs(order.price - price) < info.tick_size / 2 and order.quantity == quantity:
+                    continue  # target did not move, leave the order where it is
+                stale.append(key)
+                quantity -= order.quantity_filled  # re-place only what has not filled
+            if quantity <= 0:
+                self.filled_legs.add(key)
+                continue
+            to_place.append((key, price, quantity))
  
-        else:
-            price_etf_sold, price_etf_bought = None, None
-            price_stocks_sold = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            price_stocks_bought = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            # buy ETF at current price (plus a bit)
-            price_etf_bought = self.rolling_prices["JOY_C"][-1]
-            id_etf = place_limit_order(BUY, "JOY_C", price_etf_bought, quantity)
-            assert(id_etf is not None)
- 
-            # sell stocks at current price (minus a bit)
-            id_1 = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            for ticker in ["SAD", "ANGER", "FEAR", "CRY"]:
-                price = self.rolling_prices[ticker][-1]
-                price_stocks_sold[ticker] = price
-                id_1[ticker] = place_limit_order(SELL, ticker, price_stocks_sold[ticker], quantity // 4)
-                assert(id_1[ticker] is not None)
-                self.add_trade(ticker, price_stocks_sold[ticker], SELL, id_1[ticker], z_mean, z)
- 
-            # add trades to queue
-            self.add_trade("JOY_C", price_etf_bought, BUY, id_etf, z_mean, z)
- 
-            # sell back ETF at equilibrium price
-            price_etf_sold = eq_joy_c + z_mean
-            id_etf = place_limit_order(SELL, "JOY_C", price_etf_sold, quantity)
-            assert(id_etf is not None)
- 
-            # buy shares at equilibrium price
-            id_2 = {
-                ticker: None
-                for ticker in STOCK_TICKERS
-            }
-            for ticker in STOCK_TICKERS:
-                percentage = self.rolling_prices[ticker][-1] / (eq_joy_c + z_mean)
-                price_stocks_bought[ticker] = percentage * (eq_joy_c + z_mean)
-                id_2[ticker] = place_limit_order(BUY, ticker, price_stocks_bought[ticker], quantity // 4)
-                # add here because it's easier
-                self.add_trade(ticker, price_stocks_bought[ticker], BUY, id_2[ticker], z_mean, z)
-                assert(id_2[ticker] is not None)
+        # legs we are no longer quoting
+        stale += [key for key in self.resting if key not in targets]
+        cancelled = self.cancel_resting(stale)
  
-            # add trades to queue
-            self.add_trade("JOY_C", price_etf_sold, SELL, id_etf, z_mean, z)
+        # a re-priced leg whose cancel did not go through may have filled meanwhile;
+        # it stays resting and the next re-quote sees how it ended
+        to_place = [item for item in to_place if item[0] not in self.resting or item[0] in cancelled]
  
-            # assert(price_etf_bought < price_etf_sold)
-            for ticker in STOCK_TICKERS:
-                assert(price_stocks_bought[ticker] < price_stocks_sold[ticker])
+        for (leg, ticker, action), price, quantity in to_place:
+            order_id = place_limit_order(action, ticker, price, quantity)
+            if order_id is None:
+                continue
+            stop_loss = self.calculate_stop_loss(ticker, action, z, z_mean, price)
+            order = self.add_trade(ticker, price, action, quantity, stop_loss, order_id)
+            order.type = "LIMIT"
+            self.resting[(leg, ticker, action)] = order
+ 
+    def cancel_resting(self, keys):
+        """
+        Pull the given resting quotes off the book in one bulk cancel.
+        Only quotes the exchange confirms as cancelled are dropped; returns their keys.
+        """
+        orders = {key: self.resting[key] for key in keys if key in self.resting}
+        cancelled_ids = set(cancel_orders([order.order_id for order in orders.values()]))
+ 
+        cancelled = set()
+        for key, order in orders.items():
+            if order.order_id not in cancelled_ids:
+                continue
+            del self.resting[key]
+            self.leg_filled[key] = self.leg_filled.get(key, 0) + order.quantity_filled
+            self.remove_order(order.order_id)
+            cancelled.add(key)
+        return cancelled
+ 
+    def cancel_quotes(self):
+        """Signal is gone: cancel every resting quote and start fresh next time."""
+        with self.quote_lock:
+            self.cancel_resting(list(self.resting))
+            self.filled_legs.clear()
+            self.leg_filled.clear()
+ 
+    def open_orders(self):
+        """Open orders by id, with what has filled so far; None if the API is unavailable."""
+        orders = get_orders()
+        if orders is None:
+            return None
+        return {order["order_id"]: order for order in orders if order["status"] == "OPEN"}
  
  
     # this is only called when we have hit a tender
@@ -311,15 +470,13 @@ class OrderQueue:
  
         self.print(f"🔄 Stop loss triggered, closing order {order_id} at {price} for {ticker}")
  
-        for i in range(3):
-            if not delete_order(order_id):
-                self.print(f"❌🔄 ERROR: Failed to delete order {order_id}, retrying...")
-                self.print(get_order(order_id))
-            else:
-                place_market_order(action, ticker, trade_size)
-                return True
+        if order_id not in cancel_orders([order_id]):
+            self.print(f"❌🔄 ERROR: Failed to cancel order {order_id}")
+            self.print(get_order(order_id))
+            return False
  
-        return False
+        place_order(action, ticker, trade_size)  # no price: a stop must execute, never rest
+        return True
  
  
  
@@ -328,107 +485,102 @@ class OrderQueue:
     # checks all orders in self.queue, rmeove them if they hit stop loss
     def update_orders(self):
         """Fetches active orders from the API and updates self.queue."""
-        ticker_prices = get_all_bid_ask()
-        if not ticker_prices:
-            return  # No valid bid, do nothing
- 
-        updated_queue = []
- 
-        for order in self.queue:  # Iterates over key-value pairs
-            if not order or order is None:
-                continue
-  
-            ticker = order["ticker"]
-            quantity = order["quantity"]
-            action = order["action"]
-            stop_loss = order["stop/loss"]
-            price = order["price"]
-      
-            stop_loss_went_through = False
- 
-            if action == BUY and price < stop_loss:
-                # stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, BUY, bid)
-                stop_loss_went_through = True
-                place_market_order(SELL, ticker, quantity)
-            elif action == SELL and stop_loss < price:
-                # stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, SELL, ask)
-                stop_loss_went_through = True
-                place_market_order(BUY, ticker, quantity)
-
- 
-            if not stop_loss_went_through:
-                updated_queue.append(order)
- 
-        self.queue = updated_queue
+        for order in self.snapshot:
+            ticker = order.ticker
+            with self.ticker_lock(ticker):
+                if order.order_id not in self.queue:
+                    continue  # another task already closed it
+ 
+                quantity = order.quantity
+                action = order.action
+                stop_loss = order.stop_loss
+                price = order.price
+ 
+                stop_loss_went_through = False
+                decided_at = time.monotonic()
+ 
+                if action == BUY and price < stop_loss:
+                    # stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, BUY, bid)
+                    stop_loss_went_through = True
+                    # no price: a stop must execute, so place_order always sends it to market
+                    for order_id in place_order(SELL, ticker, quantity)["order_ids"]:
+                        self.stamp(order_id, ticker, SELL, "stop_loss", decided_at)
+                elif action == SELL and stop_loss < price:
+                    # stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, SELL, ask)
+                    stop_loss_went_through = True
+                    for order_id in place_order(BUY, ticker, quantity)["order_ids"]:
+                        self.stamp(order_id, ticker, BUY, "stop_loss", decided_at)
+ 
+                if stop_loss_went_through:
+                    self.remove_order(order.order_id)
  
     # checks all orders in self.queue, rmeove them if they hit stop loss
     def update_orders_based_on_ttl(self):
         """Fetches active orders from the API and updates self.queue."""
-        curr_tick = get_current_tick()
+        curr_tick = tick_clock.tick()  # local estimate, no /case request
         print(curr_tick)
-        ticker_prices = get_all_bid_ask()
+        ticker_prices = self.market_quotes()
         if not ticker_prices:
             return  # No valid bid, do nothing
  
-        updated_queue = {}
- 
-        for id in list(self.queue.keys()):  # Iterates over key-value pairs
-            if not id or id is None:
-                continue
+        for order in self.snapshot:
+            id = order.order_id
+            if id < 0:
+                continue  # local trade, nothing to fetch from the exchange
  
             order_rit = get_order(id)
             print(order_rit)
-            if not order_rit:
-                print(f"🚨 ERROR: Failed to fetch order {id}")
-                continue
  
-            order_rit["stop/loss"] = self.queue[id]["stop/loss"]
+            with self.ticker_lock(order.ticker):
+                if id not in self.queue:
+                    continue  # removed while we were fetching it
+                if not order_rit:
+                    print(f"🚨 ERROR: Failed to fetch order {id}")
+                    self.remove_order(id)
+                    continue
  
-            ticker = order_rit["ticker"]
-            quantity = order_rit["quantity"]
-            quantity_filled = order_rit["quantity_filled"]
-            action = order_rit["action"]
-            type_ = order_rit["type"] 
-            stop_loss = order_rit["stop/loss"]
-            open = order_rit["status"]
-            bid, ask = ticker_prices[ticker]
-            trade_size = quantity - quantity_filled
+                order.update_from(order_rit)
  
-            if quantity == quantity_filled or open != "OPEN":
-                continue
+                ticker = order.ticker
+                action = order.action
+                stop_loss = order.stop_loss
+                bid, ask = ticker_prices[ticker]
+                trade_size = order.remaining
  
-            stop_loss_went_through = False
+                if trade_size == 0 or order.status != "OPEN":
+                    self.remove_order(id)
+                    continue
  
-            if action == BUY and stop_loss < bid:
-                stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, BUY, bid)
-            elif action == SELL and ask < stop_loss:
-                stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, SELL, ask)
+                stop_loss_went_through = False
  
-            if not stop_loss_went_through:
-                updated_queue[id] = order_rit
+                if action == BUY and stop_loss < bid:
+                    stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, BUY, bid)
+                elif action == SELL and ask < stop_loss:
+                    stop_loss_went_through |= self.handle_stop_loss(id, ticker, trade_size, SELL, ask)
  
-        self.queue = updated_queue
+                if stop_loss_went_through:
+                    self.remove_order(id)
  
  
  
     def log_trades(self):
         """Displays all recorded trades."""
         self.print("\n--- TRADE LOG ---", False)
-        prices = get_all_bid_ask()
+        prices = self.market_quotes()
         # time.sleep(CHECK_INTERVAL)
         for ticker in ["FEAR", "SAD", "ANGER", "CRY"]:
             self.print(f"Position of {ticker} is {get_position(ticker)}", False)
  
-        for order in self.queue.values():
-            ticker = order["ticker"]
-            action = order["action"]
-            type = order["type"]
-            stop = order["stop/loss"]
-            price = order["price"]
-            quantity = order["quantity"]
-            quantity_filled = order["quantity_filled"]
-            open = order["status"]
-            order_id = order["order_id"]
+        for order in self.snapshot:  # lock-free, whatever was last published
+            ticker = order.ticker
+            action = order.action
+            type = order.type
+            stop = order.stop_loss
+            price = order.price
+            quantity = order.quantity
+            quantity_filled = order.quantity_filled
+            open = order.status
+            order_id = order.order_id
  
             self.print(f"{order_id}: {open} order for {type} {action} at {price} for {ticker}. Current bid is {prices[ticker][0]} and ask is {prices[ticker][1]}. Waiting for {stop} to {SELL if action == BUY else BUY} at. {quantity_filled} out of {quantity} shares.", False)
  
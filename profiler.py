@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+import numpy as np
+
+RING_SIZE = 4096
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+# SIGUSR1 on Linux/macOS; Ctrl+Break on Windows, where the RIT client runs
+PROFILE_SIGNAL = getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+
+
+class _Stage:
+    __slots__ = ("profiler", "index", "wall", "cpu", "thread")
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+
+    def __enter__(self):
+        # stages run on executor threads; the stack sampler follows whichever are inside one
+        self.thread = threading.get_ident()
+        self.profiler.active_threads.add(self.thread)
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.index, time.perf_counter() - self.wall, time.thread_time() - self.cpu)
+        self.profiler.active_threads.discard(self.thread)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of a live set of threads and counts collapsed
+    stacks (flamegraph.pl input), each rooted at its thread's name.
+    """
+
+    def __init__(self, thread_ids, interval=SAMPLE_INTERVAL):
+        self.thread_ids = thread_ids  # shared with the profiler, changes while we sample
+        self.interval = interval
+        self.stacks = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True, name="stack-sampler")
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if names:
+                    names.append(thread_names.get(thread_id, str(thread_id)))
+                    self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """
+    Wall and CPU time per strategy stage in a fixed ring buffer.
+
+    Off by default, where stage() costs one attribute check. Toggle at runtime
+    with toggle() or PROFILE_SIGNAL once install_signal_handler() was called.
+    """
+
+    def __init__(self, size=RING_SIZE, sample_stacks=False):
+        self.size = size
+        self.sample_stacks = sample_stacks
+        self.enabled = False
+        self.names = []
+        self.index = {}
+        self.stage_ids = np.zeros(size, dtype=np.int16)
+        self.wall = np.zeros(size)
+        self.cpu = np.zeros(size)
+        self.count = 0
+        self.sampler = None
+        self.active_threads = set()  # idents of threads currently inside a stage
+        self.lock = threading.Lock()  # stages can finish on several threads at once
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        i = self.index.get(name)
+        if i is None:
+            with self.lock:
+                i = self.index.get(name)
+                if i is None:
+                    i = self.index[name] = len(self.names)
+                    self.names.append(name)
+        return _Stage(self, i)
+
+    def record(self, stage_id, wall, cpu):
+        with self.lock:
+            slot = self.count % self.size
+            self.stage_ids[slot] = stage_id
+            self.wall[slot] = wall
+            self.cpu[slot] = cpu
+            self.count += 1
+
+    def start(self):
+        self.count = 0
+        if self.sample_stacks:
+            self.sampler = StackSampler(self.active_threads)
+            self.sampler.start()
+        self.enabled = True
+        print("⏱ Profiling on")
+
+    def stop(self):
+        self.enabled = False
+        print("⏱ Profiling off")
+        self.report()
+        if self.sampler is not None:
+            self.sampler.stop()
+            path = f"profile-{int(time.time())}.folded"
+            self.sampler.dump(path)
+            print(f"⏱ Stack samples written to {path}")
+            self.sampler = None
+
+    def toggle(self, signum=None, frame=None):
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+
+    def install_signal_handler(self, sig=PROFILE_SIGNAL):
+        if sig is not None:
+            signal.signal(sig, self.toggle)
+
+    def summary(self):
+        """stage -> dict of count and mean/p50/p99 wall and CPU milliseconds over the ring."""
+        n = min(self.count, self.size)
+        ids, wall, cpu = self.stage_ids[:n], self.wall[:n] * 1000, self.cpu[:n] * 1000
+        out = {}
+        for i, name in enumerate(self.names):
+            mask = ids == i
+            if not mask.any():
+                continue
+            w, c = wall[mask], cpu[mask]
+            out[name] = {
+                "count": int(mask.sum()),
+                "wall_mean": float(w.mean()),
+                "wall_p50": float(np.percentile(w, 50)),
+                "wall_p99": float(np.percentile(w, 99)),
+                "cpu_mean": float(c.mean()),
+            }
+        return out
+
+    def report(self):
+        for name, s in self.summary().items():
+            print(f"⏱ {name:<24} n={s['count']:<5} wall mean {s['wall_mean']:.2f}ms "
+                  f"p50 {s['wall_p50']:.2f}ms p99 {s['wall_p99']:.2f}ms cpu mean {s['cpu_mean']:.2f}ms")
+
+
+profiler = StageProfiler()
@@ -0,0 +1,53 @@
+import os
+import time
+import numpy as np
+from networking import STOCK_TICKERS, ETF_TICKERS
+
+RECORD_TICKERS = STOCK_TICKERS + ETF_TICKERS
+# one row per sample: tick, CAD/USD rate, then bid and ask of every ticker
+COLUMNS = ["tick", "fx"] + [f"{t}_{side}" for t in RECORD_TICKERS for side in ("bid", "ask")]
+TICK, FX = 0, 1
+SESSIONS_DIR = "sessions"
+MAX_ROWS = 20_000
+
+
+def bid_column(ticker):
+    return 2 + 2 * RECORD_TICKERS.index(ticker)
+
+
+def ask_column(ticker):
+    return bid_column(ticker) + 1
+
+
+class SessionRecorder:
+    """Records the quotes the bot trades on into a .npy file that can be memory-mapped later."""
+
+    def __init__(self, path=None, max_rows=MAX_ROWS):
+        if path is None:
+            os.makedirs(SESSIONS_DIR, exist_ok=True)
+            path = os.path.join(SESSIONS_DIR, f"session-{int(time.time())}.npy")
+        self.path = path
+        self.data = np.full((max_rows, len(COLUMNS)), np.nan)
+        self.count = 0
+
+    def record(self, tick, fx, quotes):
+        """quotes: ticker -> (bid, ask), as in the quote bus snapshot."""
+        if self.count >= len(self.data):
+            return
+        row = self.data[self.count]
+        row[TICK] = np.nan if tick is None else tick
+        row[FX] = fx
+        for ticker in RECORD_TICKERS:
+            bid, ask = quotes.get(ticker, (None, None))
+            row[bid_column(ticker)] = np.nan if bid is None else bid
+            row[ask_column(ticker)] = np.nan if ask is None else ask
+        self.count += 1
+
+    def save(self):
+        np.save(self.path, self.data[:self.count])
+        return self.path
+
+
+def load_session(path):
+    """Memory-map a recorded session read-only; pages are shared between processes."""
+    return np.load(path, mmap_mode="r")
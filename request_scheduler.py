@@ -0,0 +1,137 @@
+import time
+import threading
+
+# RIT allows a fixed number of API calls per second per trader
+REQUESTS_PER_SECOND = 25
+# the slice of it spent by the market-data process (see market_data.py) when it runs;
+# the main process gives this much up so both together stay within REQUESTS_PER_SECOND
+MARKET_DATA_RATE = 6
+
+# class -> (priority, share of the per-second budget, staleness we tolerate in seconds)
+# lower priority number wins; a staleness of 0 means the call can never be served from cache
+REQUEST_CLASSES = {
+    "orders": (0, 0.35, 0.0),
+    "tenders": (0, 0.25, 0.0),
+    "book": (1, 0.20, 0.25),
+    "case": (2, 0.05, 1.0),
+    "securities": (2, 0.10, 1.0),
+    "history": (3, 0.05, 5.0),
+}
+
+
+# the market-data process only polls /securities and recalibrates its clock from /case
+MARKET_DATA_CLASSES = {
+    **REQUEST_CLASSES,
+    "securities": (0, 0.80, 0.0),
+    "case": (1, 0.20, 1.0),
+}
+
+
+# classes that never borrow beyond their own share, however idle the rest of the bucket is
+CAPPED_CLASSES = {"tenders"}
+
+
+def classify(endpoint):
+    """Map an endpoint to its request class."""
+    # accepting or declining a tender (tenders/{id}) is order flow; only the /tenders poll is capped
+    if endpoint.startswith(("orders", "commands", "tenders/")):
+        return "orders"
+    if endpoint.startswith("tenders"):
+        return "tenders"
+    if endpoint.startswith("securities/book"):
+        return "book"
+    if endpoint.startswith("securities/history"):
+        return "history"
+    if endpoint.startswith("securities"):
+        return "securities"
+    return "case"
+
+
+class RequestScheduler:
+    """
+    Token bucket over the whole API budget, split by priority.
+
+    A class may always spend its own share. Beyond that it may only borrow
+    tokens that are not reserved for classes of higher priority, so a burst of
+    order flow pushes low-priority reads back instead of queueing behind them.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, classes=REQUEST_CLASSES):
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.configure(rate, classes)
+
+    def configure(self, rate, classes=None):
+        """Change the budget, e.g. when another process takes a slice of it."""
+        with self.lock:
+            self.rate = rate
+            self.classes = classes or self.classes
+            self.tokens = min(getattr(self, "tokens", float(rate)), float(rate))
+            self.last_refill = time.monotonic()
+
+            # tokens spent by each class in the current one-second window
+            self.window_start = self.last_refill
+            self.used = {name: 0 for name in self.classes}
+
+            # budget that classes of a given priority must leave untouched
+            self.reserved_above = {}
+            for name, (priority, _, _) in self.classes.items():
+                self.reserved_above[name] = rate * sum(
+                    share for other, (p, share, _) in self.classes.items() if p < priority
+                )
+
+    def _refill(self, now):
+        self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if now - self.window_start >= 1.0:
+            self.window_start = now
+            self.used = {name: 0 for name in self.classes}
+
+    def _try_take(self, request_class, now):
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens < 1:
+            return False
+
+        _, share, _ = self.classes[request_class]
+        within_share = self.used[request_class] < share * self.rate
+        if not within_share and (request_class in CAPPED_CLASSES
+                                 or self.tokens - 1 < self.reserved_above[request_class]):
+            return False
+
+        self.tokens -= 1
+        self.used[request_class] += 1
+        return True
+
+    def acquire(self, request_class, block=True, timeout=None):
+        """
+        Take one request token. Returns False when block is False and none is
+        free, or when none became free within `timeout` seconds.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if self._try_take(request_class, now):
+                    return True
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate, 0.005)
+            if not block:
+                return False
+            if end is not None:
+                left = end - time.monotonic()
+                if left <= 0:
+                    return False
+                wait = min(wait, left)
+            time.sleep(wait)
+
+    def fresh_enough(self, request_class, fetched_at):
+        """True if a cached response of this class may be reused instead of spending a token."""
+        staleness = self.classes[request_class][2]
+        return staleness > 0 and time.monotonic() - fetched_at <= staleness
+
+    def backoff(self, wait):
+        """The exchange said TOO_MANY_REQUESTS: stop handing out tokens for `wait` seconds."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + wait)
+            self.tokens = 0
@@ -0,0 +1,82 @@
+import time
+import random
+import threading
+
+# consecutive failures before the breaker opens, and how long it stays open
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 2.0
+
+BACKOFF_BASE = 0.02  # seconds, first retry waits up to this long
+BACKOFF_CAP = 0.25
+
+
+class Deadline:
+    """A fixed time budget that every attempt and retry sleep of one call draws from."""
+
+    def __init__(self, budget):
+        self.expires = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def backoff_delay(attempt, deadline=None):
+    """Full-jitter exponential backoff, never sleeping past the deadline."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    if deadline is not None:
+        delay = min(delay, deadline.remaining())
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Opens after FAILURE_THRESHOLD consecutive failed calls. While open every
+    call fails fast; after OPEN_SECONDS one probe call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, open_seconds=OPEN_SECONDS):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                print("✅ API recovered, leaving safe mode")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+                if self.opened_at is None:
+                    print(f"🛑 {self.failures} API failures in a row, entering safe mode")
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def cancel_probe(self):
+        """The call let through never reached the API; let the next one probe instead."""
+        with self.lock:
+            self.probing = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
@@ -0,0 +1,107 @@
+from networking import *
+
+# fallbacks when /securities does not report a max trade size
+ORDER_LIMIT_STOCK = 50_000
+ORDER_LIMIT_ETF = 100_000
+MARKET = "MARKET"
+LIMIT = "LIMIT"
+
+
+class SecurityInfo:
+    """Static per-security metadata, plus the routing decisions derived from it."""
+    __slots__ = ("ticker", "currency", "trading_fee", "rebate", "max_trade_size",
+                 "tick_size", "is_tradeable", "route", "child_size")
+
+    def __init__(self, ticker, currency, trading_fee, rebate, max_trade_size, tick_size, is_tradeable):
+        self.ticker = ticker
+        self.currency = currency
+        self.trading_fee = trading_fee
+        self.rebate = rebate
+        self.max_trade_size = max_trade_size
+        self.tick_size = tick_size
+        self.is_tradeable = is_tradeable
+
+        # resting pays when the book rebates passive orders; otherwise just take liquidity
+        self.route = LIMIT if rebate > 0 else MARKET
+        limit = ORDER_LIMIT_ETF if ticker in ETF_TICKERS else ORDER_LIMIT_STOCK
+        self.child_size = min(max_trade_size, limit) if max_trade_size else limit
+
+    def round_price(self, price):
+        return round(round(price / self.tick_size) * self.tick_size, 10)
+
+    def __repr__(self):
+        return (f"SecurityInfo({self.ticker}, {self.currency}, fee {self.trading_fee}, "
+                f"rebate {self.rebate}, {self.route}, child {self.child_size})")
+
+
+def parse_security(sec):
+    decimals = sec.get("quoted_decimals", 2)
+    return SecurityInfo(
+        ticker=sec["ticker"],
+        currency=sec.get("currency", "CAD"),
+        trading_fee=sec.get("trading_fee", 0.0) or 0.0,
+        rebate=sec.get("limit_order_rebate", 0.0) or 0.0,
+        max_trade_size=sec.get("max_trade_size", 0) or 0,
+        tick_size=10 ** -decimals,
+        is_tradeable=sec.get("is_tradeable", True),
+    )
+
+
+class SecurityRegistry:
+    """Loaded once at warm-up; afterwards every lookup is a dict access."""
+
+    def __init__(self):
+        self.securities = {}
+        # ticker -> (route, child_size), the only thing the order path needs
+        self.routes = {}
+
+    def load(self):
+        securities = get_json("securities")
+        if not securities:
+            print("⚠ Could not load security metadata, using defaults")
+            return False
+
+        for sec in securities:
+            info = parse_security(sec)
+            self.securities[info.ticker] = info
+            self.routes[info.ticker] = (info.route, info.child_size)
+        return True
+
+    def info(self, ticker):
+        info = self.securities.get(ticker)
+        if info is None:
+            # unknown until load() succeeds: RIT defaults of 2 decimals, no fees
+            info = SecurityInfo(ticker, "CAD", 0.0, 0.0, 0, 0.01, True)
+            self.securities[ticker] = info
+            self.routes[ticker] = (info.route, info.child_size)
+        return info
+
+    def route(self, ticker):
+        if ticker not in self.routes:
+            self.info(ticker)
+        return self.routes[ticker]
+
+    def child_size(self, ticker):
+        return self.route(ticker)[1]
+
+    def tick_size(self, ticker):
+        return self.info(ticker).tick_size
+
+    def fee(self, ticker):
+        return self.info(ticker).trading_fee
+
+
+registry = SecurityRegistry()
+
+
+def place_order(action, ticker, quantity, price=None):
+    """
+    Places a market or limit order based on the security's transaction fees:
+    a limit order at `price` where resting earns a rebate and a price is known,
+    a market order otherwise. Quantities above the per-order maximum are sliced,
+    the aggregated result of place_sliced_order is returned.
+    """
+    route, child_size = registry.route(ticker)
+    if route == LIMIT and price is not None:
+        return place_sliced_order(action, ticker, quantity, registry.info(ticker).round_price(price), child_size)
+    return place_sliced_order(action, ticker, quantity, max_child=child_size)
@@ -0,0 +1,122 @@
+import math
+import numpy as np
+
+SPREAD_WINDOWS = (50, 200, 500)  # ticks; the largest should not exceed ROLLING_WINDOW_SIZE
+SPREAD_HALFLIFE = 30             # ticks for the exponentially weighted estimate
+
+
+class EWStats:
+    """Exponentially weighted mean and variance, O(1) per update."""
+
+    def __init__(self, halflife=SPREAD_HALFLIFE):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, x):
+        if self.count == 0:
+            self.mean = x
+        else:
+            diff = x - self.mean
+            incr = self.alpha * diff
+            self.mean += incr
+            self.var = (1 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+
+class WindowedStats:
+    """
+    Mean and variance over several trailing windows at once.
+
+    Every window shares one ring buffer sized for the longest window, and is
+    updated with Welford's algorithm: plain adds while it fills, then a
+    sliding add/remove of the value leaving it. Each tick is O(number of
+    windows), no matter how long the windows are.
+    """
+
+    def __init__(self, windows=SPREAD_WINDOWS):
+        self.windows = np.array(sorted(windows), dtype=np.int64)
+        self.size = int(self.windows[-1])
+        self.buffer = np.zeros(self.size)
+        self.count = 0
+        self.n = np.zeros(len(self.windows))
+        self.mean = np.zeros(len(self.windows))
+        self.m2 = np.zeros(len(self.windows))
+
+    def update(self, x):
+        full = self.n >= self.windows
+
+        # windows still filling: standard Welford add
+        filling = ~full
+        if filling.any():
+            n = self.n[filling] + 1
+            delta = x - self.mean[filling]
+            mean = self.mean[filling] + delta / n
+            self.m2[filling] += delta * (x - mean)
+            self.mean[filling] = mean
+            self.n[filling] = n
+
+        # full windows: replace the value falling out of each window
+        if full.any():
+            old = self.buffer[(self.count - self.windows[full]) % self.size]
+            w = self.windows[full]
+            mean = self.mean[full] + (x - old) / w
+            self.m2[full] += (x - old) * (x - mean + old - self.mean[full])
+            self.mean[full] = mean
+
+        np.maximum(self.m2, 0, out=self.m2)  # guard against rounding drift
+        self.buffer[self.count % self.size] = x
+        self.count += 1
+
+    def index(self, window):
+        return int(np.searchsorted(self.windows, window))
+
+    def ready(self, window):
+        return self.n[self.index(window)] >= window
+
+    def std(self, window):
+        i = self.index(window)
+        return math.sqrt(self.m2[i] / (self.n[i] - 1)) if self.n[i] > 1 else 0.0
+
+
+class SpreadStats:
+    """Streaming statistics of one equilibrium-minus-market spread."""
+
+    def __init__(self, windows=SPREAD_WINDOWS, halflife=SPREAD_HALFLIFE):
+        self.windowed = WindowedStats(windows)
+        self.ewm = EWStats(halflife)
+        self.last = None
+
+    def update(self, spread):
+        self.last = spread
+        self.windowed.update(spread)
+        self.ewm.update(spread)
+
+    def ready(self, window=None):
+        if window is None:
+            return self.ewm.count >= 2
+        return self.windowed.ready(window)
+
+    def snapshot(self, window=None):
+        """
+        Returns the values the strategies use:
+        z is the latest spread, z_mean its mean, sigma its standard deviation
+        and z_sd the number of sigmas z is away from z_mean.
+        With no window the exponentially weighted estimate is used.
+        """
+        if self.last is None:
+            return None
+        if window is None:
+            z_mean, sigma = self.ewm.mean, self.ewm.std
+        else:
+            i = self.windowed.index(window)
+            z_mean, sigma = float(self.windowed.mean[i]), self.windowed.std(window)
+
+        z = self.last
+        z_sd = (z - z_mean) / sigma if sigma > 0 else 0.0
+        return {"z": z, "z_mean": z_mean, "sigma": sigma, "z_sd": z_sd}
@@ -0,0 +1,162 @@
+import os
+import sys
+import csv
+import glob
+import random
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from recorder import load_session, bid_column, ask_column
+from spread_stats import SpreadStats, SPREAD_WINDOWS
+from networking import STOCK_TICKERS
+
+# SPREAD_THRESHOLD, Z_ENTRY, SIGNAL_WINDOW and ORDER_SIZE in main.py; the
+# current values are in each list. ALPHA in order_queue.py is only the stop
+# distance of tender positions, and tenders are not recorded, so it is not swept
+GRID = {
+    "spread_threshold": [0.1, 0.2, 0.3, 0.5, 0.75, 1.0],
+    "z_entry": [0.0, 1.0, 1.5, 2.0, 2.5],
+    "signal_window": list(SPREAD_WINDOWS),
+    "order_size": [500, 1_000, 2_000, 5_000, 10_000],
+}
+MAX_LONG_EXPOSURE = 300_000
+MAX_SHORT_EXPOSURE = 200_000  # the limits in main.py, which cannot be imported without starting it
+RESULTS_FILE = "sweep_results.csv"
+
+
+def simulate(path, params):
+    """
+    Replay one recorded session through the JOY_C spread strategy.
+
+    Like arbitrage(), every sample with a signal crosses the spread for one
+    more unit: order_size of JOY_C one way and of every stock the other way,
+    as long as the position stays within the gross and net limits.
+
+    The exit is not the live one. arbitrage() never closes a unit: its
+    position only shrinks through offload_for_tender once a limit binds, and
+    whatever is left is marked at the end of the case. Here all units are
+    closed once the spread is back at its mean. The ranking is therefore for
+    entry settings under that exit, and order_size decides how fast the
+    limits bind, not just the scale of the P&L.
+    """
+    data = load_session(path)
+    stats = SpreadStats()
+    window = params["signal_window"]
+    size = params["order_size"]
+    legs = 1 + len(STOCK_TICKERS)
+
+    etf_bid, etf_ask = bid_column("JOY_C"), ask_column("JOY_C")
+    stock_bids = [bid_column(t) for t in STOCK_TICKERS]
+    stock_asks = [ask_column(t) for t in STOCK_TICKERS]
+
+    cash = 0.0
+    side = 0          # +1 long JOY_C / short stocks, -1 the reverse
+    units = 0
+    trades = 0
+    equity = []
+
+    for row in data:
+        if np.isnan(row[etf_bid:etf_ask + 1]).any() or np.isnan(row[stock_bids + stock_asks]).any():
+            continue
+        etf_mid = (row[etf_bid] + row[etf_ask]) / 2
+        stock_mids = (row[stock_bids] + row[stock_asks]) / 2
+        eq = stock_mids.sum()
+        stats.update(eq - etf_mid)
+        snap = stats.snapshot(window)
+
+        if units and (snap["z"] - snap["z_mean"]) * side <= 0:
+            # reverted: close at the touch, sell what we bought, buy back what we sold
+            if side > 0:
+                cash += units * size * (row[etf_bid] - row[stock_asks].sum())
+            else:
+                cash += units * size * (row[stock_bids].sum() - row[etf_ask])
+            side = units = 0
+
+        signal = 0
+        if abs(snap["z"]) > params["spread_threshold"]:
+            if not stats.ready(window) or abs(snap["z_sd"]) >= params["z_entry"]:
+                signal = 1 if snap["z"] > 0 else -1
+
+        if signal and (not units or signal == side):
+            # one more unit: gross grows by every leg, net by the ETF leg minus the stock legs
+            gross = (units + 1) * size * legs
+            net = (units + 1) * size * (legs - 2)
+            if gross <= MAX_LONG_EXPOSURE and net <= MAX_SHORT_EXPOSURE:
+                side = signal
+                units += 1
+                if side > 0:
+                    cash -= size * (row[etf_ask] - row[stock_bids].sum())
+                else:
+                    cash -= size * (row[stock_asks].sum() - row[etf_bid])
+                trades += 1
+
+        mark = units * size * side * (etf_mid - stock_mids.sum())
+        equity.append(cash + mark)
+
+    equity = np.asarray(equity) if equity else np.zeros(1)
+    drawdown = float((np.maximum.accumulate(equity) - equity).max())
+    return {"pnl": float(equity[-1]), "trades": trades, "max_drawdown": drawdown}
+
+
+def grid_params():
+    keys = list(GRID)
+    for values in itertools.product(*(GRID[k] for k in keys)):
+        yield dict(zip(keys, values))
+
+
+def random_params(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield {k: rng.choice(v) for k, v in GRID.items()}
+
+
+def _run_job(job):
+    index, path, params = job
+    return index, path, simulate(path, params)
+
+
+def run_sweep(sessions, param_sets, processes=None, results_file=RESULTS_FILE):
+    """Evaluate every parameter set on every session across all cores, rank by mean P&L."""
+    param_sets = list(param_sets)
+    jobs = [(i, path, params) for i, params in enumerate(param_sets) for path in sessions]
+
+    per_params = [[] for _ in param_sets]
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        for index, path, result in pool.map(_run_job, jobs, chunksize=max(1, len(jobs) // 64)):
+            per_params[index].append(result)
+
+    rows = []
+    for params, results in zip(param_sets, per_params):
+        pnl = np.array([r["pnl"] for r in results])
+        rows.append({
+            **params,
+            "mean_pnl": float(pnl.mean()),
+            "min_pnl": float(pnl.min()),
+            "trades": sum(r["trades"] for r in results),
+            "max_drawdown": max(r["max_drawdown"] for r in results),
+        })
+    rows.sort(key=lambda r: r["mean_pnl"], reverse=True)
+
+    with open(results_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    # python sweep.py "sessions/*.npy" [--random N]
+    pattern = sys.argv[1] if len(sys.argv) > 1 else "sessions/*.npy"
+    sessions = sorted(glob.glob(pattern))
+    if not sessions:
+        sys.exit(f"No recorded sessions match {pattern}")
+
+    if "--random" in sys.argv:
+        param_sets = random_params(int(sys.argv[sys.argv.index("--random") + 1]))
+    else:
+        param_sets = grid_params()
+
+    rows = run_sweep(sessions, param_sets)
+    print(f"🏁 {len(rows)} parameter sets over {len(sessions)} sessions, results in {RESULTS_FILE}")
+    for row in rows[:10]:
+        print(row)
@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from profiler import profiler
+
+
+class PeriodicTask:
+    """One strategy component: a blocking function run every `interval` seconds."""
+
+    def __init__(self, name, fn, interval, priority=1, when=None):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.priority = priority  # 0 is most urgent
+        self.when = when          # optional gate, the task is skipped while it returns False
+        self.runs = 0
+        self.overruns = 0
+
+
+class TaskRuntime:
+    """
+    Runs each PeriodicTask as its own asyncio task with its own cadence.
+
+    The blocking API work of a task runs on an executor owned by its priority
+    level, so a slow tender scan or a rate-limit wait only delays tasks of the
+    same priority, never the ones above it. Tasks share state (the price
+    windows, the order queue) through the objects their functions close over.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.executors = {}
+
+    def add(self, name, fn, interval, priority=1, when=None):
+        task = PeriodicTask(name, fn, interval, priority, when)
+        self.tasks.append(task)
+        return task
+
+    def executor(self, priority):
+        if priority not in self.executors:
+            # the most urgent level gets a worker per task so they can't queue behind each other
+            workers = sum(1 for t in self.tasks if t.priority == priority) if priority == 0 else 1
+            self.executors[priority] = ThreadPoolExecutor(max_workers=max(workers, 1),
+                                                          thread_name_prefix=f"prio{priority}")
+        return self.executors[priority]
+
+    def _step(self, task):
+        with profiler.stage(task.name):
+            task.fn()
+
+    async def _run(self, task):
+        loop = asyncio.get_running_loop()
+        executor = self.executor(task.priority)
+        while True:
+            start = loop.time()
+            if task.when is None or task.when():
+                try:
+                    await loop.run_in_executor(executor, self._step, task)
+                except Exception as e:
+                    print(f"❌ Task {task.name} failed: {e!r}")
+                task.runs += 1
+
+            elapsed = loop.time() - start
+            if elapsed > task.interval:
+                task.overruns += 1
+            await asyncio.sleep(max(0.0, task.interval - elapsed))
+
+    async def _main(self):
+        # start the most urgent tasks first
+        ordered = sorted(self.tasks, key=lambda t: t.priority)
+        await asyncio.gather(*(self._run(task) for task in ordered))
+
+    def run(self):
+        try:
+            asyncio.run(self._main())
+        finally:
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
@@ -0,0 +1,59 @@
+import time
+from networking import get_tenders
+
+# seconds between polls; the tenders class is capped at its share of the
+# request budget (see request_scheduler.py), which allows about this rate
+TENDER_POLL_INTERVAL = 0.2
+# an undecided tender is retried after this long, doubling up to the cap
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 4.0
+
+
+class TenderWatcher:
+    """
+    Polls /tenders and diffs the result by tender_id, so each tender is
+    evaluated once when it appears instead of on every cycle.
+
+    on_tender(tender) returns True once it accepted or declined the tender.
+    A falsy return (no quote yet, limits in the way) keeps the tender pending
+    and it is offered again after a backoff of RETRY_DELAY, doubling each time.
+    on_expired(tender) is called for tenders that disappear without a decision.
+    """
+
+    def __init__(self, on_tender, on_expired=None):
+        self.on_tender = on_tender
+        self.on_expired = on_expired
+        self.known = {}        # tender_id -> tender, as of the last poll
+        self.pending = {}      # seen but not decided yet: tender_id -> (retry at, delay)
+        self.decided = set()
+
+    def poll(self):
+        tenders = get_tenders()
+        if tenders is None:
+            return  # API failure, keep what we know
+
+        current = {tender["tender_id"]: tender for tender in tenders}
+
+        for tender_id in self.known.keys() - current.keys():
+            self.pending.pop(tender_id, None)
+            if tender_id in self.decided:
+                self.decided.discard(tender_id)
+            elif self.on_expired is not None:
+                self.on_expired(self.known[tender_id])
+
+        # new tenders, plus pending ones whose retry is due
+        now = time.monotonic()
+        for tender_id, tender in current.items():
+            if tender_id in self.decided:
+                continue
+            retry_at, delay = self.pending.get(tender_id, (now, RETRY_DELAY / 2))
+            if now < retry_at:
+                continue
+            if self.on_tender(tender):
+                self.pending.pop(tender_id, None)
+                self.decided.add(tender_id)
+            else:
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                self.pending[tender_id] = (time.monotonic() + delay, delay)
+
+        self.known = current
@@ -0,0 +1,138 @@
+import math
+import time
+import threading
+from collections import deque
+from networking import get_json
+
+SECONDS_PER_TICK = 1.0     # RIT default; re-estimated once enough ticks have been seen
+RECALIBRATE_INTERVAL = 5.0 # seconds between background /case samples
+MIN_TICKS_FOR_RATE = 10    # ticks spanned before we trust our own rate estimate
+MAX_SAMPLES = 50
+
+
+class TickClock:
+    """
+    Estimates the exchange tick locally from the monotonic clock.
+
+    Each /case sample says tick k was current somewhere between sending the
+    request and getting the answer, which bounds when tick 0 started (t0).
+    Intersecting those bounds over many samples narrows t0 down; the width of
+    what is left is the confidence of every estimate.
+    """
+
+    def __init__(self, seconds_per_tick=SECONDS_PER_TICK):
+        self.period = seconds_per_tick
+        self.samples = deque(maxlen=MAX_SAMPLES)  # (sent, received, tick)
+        self.t0_low = None
+        self.t0_high = None
+        self.ticks_per_period = None
+        self.running = False  # False when the case is paused or stopped
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def sample(self):
+        """Fetch /case once and fold it into the calibration. Returns the tick or None."""
+        sent = time.monotonic()
+        case = get_json("case")
+        received = time.monotonic()
+        if not case:
+            return None
+
+        tick = case.get("tick")
+        with self.lock:
+            self.ticks_per_period = case.get("ticks_per_period", self.ticks_per_period)
+            self.running = case.get("status", "ACTIVE") == "ACTIVE"
+            if tick is None:
+                return None
+            self._add_sample(sent, received, tick)
+        return tick
+
+    def _add_sample(self, sent, received, tick):
+        if self.samples and tick < self.samples[-1][2]:
+            self.samples.clear()  # new case or period restarted
+
+        self.samples.append((sent, received, tick))
+        self._estimate_period()
+
+        low, high = self._bounds(sent, received, tick)
+        if self.t0_low is None or low > self.t0_high or high < self.t0_low:
+            # first sample, or the clock jumped (pause/resume): start over from this one
+            self.samples.clear()
+            self.samples.append((sent, received, tick))
+            self.t0_low, self.t0_high = low, high
+        else:
+            self.t0_low = max(self.t0_low, low)
+            self.t0_high = min(self.t0_high, high)
+
+    def _bounds(self, sent, received, tick):
+        # tick started no later than `received` and tick + 1 had not started at `sent`
+        return sent - (tick + 1) * self.period, received - tick * self.period
+
+    def _estimate_period(self):
+        first, last = self.samples[0], self.samples[-1]
+        span = last[2] - first[2]
+        if span >= MIN_TICKS_FOR_RATE:
+            elapsed = (last[0] + last[1]) / 2 - (first[0] + first[1]) / 2
+            self.period = elapsed / span
+            # re-derive the phase window from scratch under the new rate
+            self.t0_low, self.t0_high = -math.inf, math.inf
+            for sent, received, tick in self.samples:
+                low, high = self._bounds(sent, received, tick)
+                self.t0_low = max(self.t0_low, low)
+                self.t0_high = min(self.t0_high, high)
+            if self.t0_low > self.t0_high:
+                self.t0_low = self.t0_high = (self.t0_low + self.t0_high) / 2
+
+    @property
+    def calibrated(self):
+        return self.t0_low is not None
+
+    def _t0(self):
+        return (self.t0_low + self.t0_high) / 2
+
+    def tick(self):
+        """Current tick estimate, or None until the first sample."""
+        with self.lock:
+            if not self.calibrated:
+                return None
+            if not self.running:
+                return self.samples[-1][2]
+            return int((time.monotonic() - self._t0()) // self.period)
+
+    def time_to_next_tick(self):
+        """Seconds until the next tick starts (None until calibrated)."""
+        with self.lock:
+            if not self.calibrated:
+                return None
+            elapsed = time.monotonic() - self._t0()
+            return self.period - elapsed % self.period
+
+    def uncertainty(self):
+        """Half-width in seconds of the window the tick boundaries are known to lie in."""
+        with self.lock:
+            if not self.calibrated:
+                return None
+            return (self.t0_high - self.t0_low) / 2
+
+    def ticks_remaining(self):
+        tick = self.tick()
+        if tick is None or not self.ticks_per_period:
+            return None
+        return self.ticks_per_period - tick
+
+    def start(self, interval=RECALIBRATE_INTERVAL):
+        """Recalibrate in a background thread every `interval` seconds."""
+        if self.thread is not None:
+            return
+        self.sample()
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.sample()
+
+        self.thread = threading.Thread(target=loop, daemon=True, name="tick-clock")
+        self.thread.start()
+
+
+tick_clock = TickClock()